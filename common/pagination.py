@@ -1,4 +1,4 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 from django.conf import settings
 
@@ -38,4 +38,39 @@ class StandardResultsSetPagination(PageNumberPagination):
                 'next_page_url': self.get_next_link(),
                 'prev_page_url': self.get_previous_link(),
             }
-        })
\ No newline at end of file
+        })
+
+
+class NewestFirstCursorPagination(CursorPagination):
+    """
+    Keyset pagination over created_at, newest first.
+
+    Each page seeks straight to its cursor instead of scanning past an
+    OFFSET, so deep pages cost the same as the first. There's no total or
+    page number, as counting the rows is what this avoids.
+    """
+    page_size = getattr(settings, 'DEFAULT_PAGE_SIZE', 20)
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    ordering = '-created_at'
+
+    def get_paginated_response(self, data):
+        """
+        Return a paginated response in the format:
+        {
+            "data": [...],
+            "pagination": {
+                "per_page": 20,
+                "next_page_url": "https://api.example.com/items?cursor=cD0y",
+                "prev_page_url": null
+            }
+        }
+        """
+        return Response({
+            'data': data,
+            'pagination': {
+                'per_page': self.get_page_size(self.request),
+                'next_page_url': self.get_next_link(),
+                'prev_page_url': self.get_previous_link(),
+            }
+        })
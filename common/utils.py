@@ -1,6 +1,14 @@
+import hashlib
 import logging
+import os
+import time
 import uuid
+from functools import lru_cache
+from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.core.cache import cache
 from django.utils import timezone
 from django.conf import settings
 from rest_framework.views import exception_handler
@@ -13,6 +21,20 @@ def generate_unique_id():
     """Generate a unique identifier for database records."""
     return str(uuid.uuid4())
 
+def uuid7():
+    """
+    Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The leading 48 bits are the Unix time in milliseconds, so keys generated
+    one after another land next to each other in a B-tree index instead of on
+    random pages. The rest is random.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    # Set the version (0111) and variant (10) bits
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
 def custom_exception_handler(exc, context):
     """
     Custom exception handler for DRF.
@@ -89,21 +111,41 @@ def validate_mcp_server_url(url):
     except requests.RequestException as e:
         return False, {"error": str(e)}
 
-def check_server_health(url):
+def check_server_health(url, session=requests):
     """
     Check if an MCP server is healthy and responding.
+
+    Pass a requests Session to reuse its pooled connections.
     """
     try:
-        response = requests.get(f"{url}", timeout=3)
+        response = session.get(f"{url}", timeout=3)
         return response.status_code == 200, response.elapsed.total_seconds()
     except requests.RequestException:
         return False, 0
 
+def build_http_session(pool_size=64, retries=2):
+    """
+    Build a requests Session that keeps connections to each host alive and
+    retries connection errors and 502/503/504 responses with a short backoff.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+@lru_cache(maxsize=4096)
 def extract_domain_from_url(url):
     """
     Extract the domain from a URL.
     """
-    from urllib.parse import urlparse
     return urlparse(url).netloc
 
 def get_client_ip(request):
@@ -121,4 +163,30 @@ def timestamp_now():
     """
     Get the current timestamp in ISO format.
     """
-    return timezone.now().isoformat()
\ No newline at end of file
+    return timezone.now().isoformat()
+
+def get_cache_version(namespace):
+    """
+    Get the current version number of a cache namespace.
+
+    Keys built with the version go stale as soon as bump_cache_version() is
+    called, which stands in for pattern deletes the cache backend lacks.
+    """
+    return cache.get_or_set(f"{namespace}:version", 1, None)
+
+def bump_cache_version(namespace):
+    """
+    Invalidate every key in a cache namespace by moving to a new version.
+    """
+    key = f"{namespace}:version"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+def request_cache_key(namespace, request):
+    """
+    Build a versioned cache key for a GET request, keyed on host and full path.
+    """
+    digest = hashlib.md5(f"{request.get_host()}{request.get_full_path()}".encode()).hexdigest()
+    return f"{namespace}:{get_cache_version(namespace)}:{digest}"
@@ -56,9 +56,8 @@ class SearchView(views.APIView):
             queryset = queryset.filter(types__contains=[server_type])
 
         if tags:
-            tag_list = tags.split(',')
-            for tag in tag_list:
-                queryset = queryset.filter(tags__contains=[tag.strip()])
+            # One array containment (@>) check instead of one per tag
+            queryset = queryset.filter(tags__contains=[tag.strip() for tag in tags.split(',')])
 
         if verified is not None:
             queryset = queryset.filter(verified=verified)
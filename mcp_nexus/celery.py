@@ -20,6 +20,10 @@ app.conf.beat_schedule = {
         'task': 'verification.tasks.run_scheduled_health_checks',
         'schedule': crontab(minute=0),  # Run every hour
     },
+    'rebuild-uptime-counters-daily': {
+        'task': 'verification.tasks.rebuild_uptime_counters',
+        'schedule': crontab(hour=0, minute=30),  # Run at 12:30 AM
+    },
     'generate-daily-network-analytics': {
         'task': 'analytics.tasks.generate_daily_network_analytics',
         'schedule': crontab(hour=1, minute=0),  # Run at 1:00 AM
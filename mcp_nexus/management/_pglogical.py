@@ -0,0 +1,102 @@
+"""
+pglogical SQL shared by the setup_pglogical/subscribe_pglogical management
+commands and the subscription Celery task.
+
+Each helper takes an open cursor and is safe to re-run: creating something
+that already exists returns False instead of raising.
+"""
+import os
+from functools import lru_cache
+
+from psycopg2 import errorcodes
+from psycopg2.extensions import make_dsn, parse_dsn
+
+# pglogical reports most "already there" conditions with a plain ERROR, so
+# fall back to the message when the SQLSTATE isn't specific enough.
+_ALREADY_EXISTS_CODES = {errorcodes.DUPLICATE_OBJECT, errorcodes.UNIQUE_VIOLATION}
+_ALREADY_EXISTS_MESSAGES = ("already configured as pglogical node", "already exists")
+
+# libpq options that make an unreachable provider fail in seconds rather than
+# after the ~2 minute TCP timeout. pglogical keeps them for its apply worker.
+_PROVIDER_DSN_DEFAULTS = {
+    'connect_timeout': '5',
+    'keepalives': '1',
+    'keepalives_idle': '10',
+    'keepalives_interval': '3',
+    'keepalives_count': '2',
+}
+
+
+def _already_exists(error):
+    """Return True if a database error only means the object exists already."""
+    if getattr(error.__cause__, 'pgcode', None) in _ALREADY_EXISTS_CODES:
+        return True
+    return any(msg in str(error) for msg in _ALREADY_EXISTS_MESSAGES)
+
+
+def provider_dsn(dsn):
+    """Add connect timeout and keepalive options to a DSN, keeping any set explicitly."""
+    options = {**_PROVIDER_DSN_DEFAULTS, **parse_dsn(dsn)}
+    return make_dsn(**options)
+
+
+@lru_cache(maxsize=None)
+def pglogical_env():
+    """
+    PGLOGICAL_* settings from the environment, read once per process.
+
+    remote_dsn already has the provider_dsn() options applied, or is None
+    when PGLOGICAL_REMOTE_DSN isn't set.
+    """
+    remote_dsn = os.environ.get('PGLOGICAL_REMOTE_DSN')
+    return {
+        'node_name': os.environ.get('PGLOGICAL_NODE_NAME'),
+        'local_dsn': os.environ.get('PGLOGICAL_LOCAL_DSN', ''),
+        'remote_node_name': os.environ.get('PGLOGICAL_REMOTE_NODE_NAME'),
+        'remote_dsn': provider_dsn(remote_dsn) if remote_dsn else None,
+    }
+
+
+def create_extension(cursor):
+    """Create the pglogical extension if it isn't installed yet."""
+    cursor.execute("CREATE EXTENSION IF NOT EXISTS pglogical;")
+
+
+def create_node(cursor, node_name, dsn):
+    """Create the local pglogical node. Returns False if it already exists."""
+    try:
+        cursor.execute("""
+            SELECT pglogical.create_node(
+                node_name := %s,
+                dsn := %s
+            );
+        """, [node_name, dsn])
+    except Exception as e:
+        if _already_exists(e):
+            return False
+        raise
+    return True
+
+
+def add_default_repset(cursor):
+    """Add every table in the public schema to the default replication set."""
+    cursor.execute("""
+        SELECT pglogical.replication_set_add_all_tables('default', ARRAY['public'], true);
+    """)
+
+
+def create_subscription(cursor, subscription_name, provider_dsn):
+    """Subscribe to the default replication set of a provider. Returns False if it already exists."""
+    try:
+        cursor.execute("""
+            SELECT pglogical.create_subscription(
+                subscription_name := %s,
+                provider_dsn := %s,
+                replication_sets := ARRAY['default']
+            );
+        """, [subscription_name, provider_dsn])
+    except Exception as e:
+        if _already_exists(e):
+            return False
+        raise
+    return True
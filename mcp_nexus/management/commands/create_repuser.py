@@ -10,6 +10,8 @@ class Command(BaseCommand):
         username = os.environ.get('REPLICATION_USER', 'repuser')
         password = os.environ.get('REPLICATION_PASSWORD', 'repuser')
 
+        user = sql.Identifier(username)
+
         with connection.cursor() as cursor:
             # Check if the role exists
             cursor.execute(
@@ -19,60 +21,30 @@ class Command(BaseCommand):
             if not cursor.fetchone():
                 # Create the role with LOGIN and REPLICATION privileges
                 cursor.execute(
-                    sql.SQL("CREATE ROLE {} WITH LOGIN REPLICATION PASSWORD %s").format(
-                        sql.Identifier(username)
-                    ),
+                    sql.SQL("CREATE ROLE {} WITH LOGIN REPLICATION PASSWORD %s").format(user),
                     [password]
                 )
 
-            # Grant CONNECT privilege on the current database
-            cursor.execute(
+            grants = [
+                # Grant CONNECT privilege on the current database
                 sql.SQL("GRANT CONNECT ON DATABASE {} TO {}").format(
-                    sql.Identifier(connection.settings_dict['NAME']),
-                    sql.Identifier(username)
-                )
-            )
-
-            # Grant USAGE on the public schema
-            cursor.execute(
-                sql.SQL("GRANT USAGE ON SCHEMA public TO {}").format(
-                    sql.Identifier(username)
-                )
-            )
-
-            # Grant SELECT on all existing tables in the public schema
-            cursor.execute(
-                sql.SQL("GRANT SELECT ON ALL TABLES IN SCHEMA public TO {}").format(
-                    sql.Identifier(username)
-                )
-            )
-
-            # Ensure future tables in the public schema have SELECT granted to the replication user
-            cursor.execute(
-                sql.SQL("ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT SELECT ON TABLES TO {}").format(
-                    sql.Identifier(username)
-                )
-            )
-
-            # Grant USAGE on the pglogical schema
-            cursor.execute(
-                sql.SQL("GRANT USAGE ON SCHEMA pglogical TO {}").format(
-                    sql.Identifier(username)
-                )
-            )
-
-            # Grant SELECT on all tables in the pglogical schema
-            cursor.execute(
-                sql.SQL("GRANT SELECT ON ALL TABLES IN SCHEMA pglogical TO {}").format(
-                    sql.Identifier(username)
-                )
-            )
-
-            # Grant EXECUTE on all functions in the pglogical schema
-            cursor.execute(
-                sql.SQL("GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA pglogical TO {}").format(
-                    sql.Identifier(username)
-                )
-            )
+                    sql.Identifier(connection.settings_dict['NAME']), user
+                ),
+                # Grant USAGE on the public schema
+                sql.SQL("GRANT USAGE ON SCHEMA public TO {}").format(user),
+                # Grant SELECT on all existing tables in the public schema
+                sql.SQL("GRANT SELECT ON ALL TABLES IN SCHEMA public TO {}").format(user),
+                # Ensure future tables in the public schema have SELECT granted to the replication user
+                sql.SQL("ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT SELECT ON TABLES TO {}").format(user),
+                # Grant USAGE on the pglogical schema
+                sql.SQL("GRANT USAGE ON SCHEMA pglogical TO {}").format(user),
+                # Grant SELECT on all tables in the pglogical schema
+                sql.SQL("GRANT SELECT ON ALL TABLES IN SCHEMA pglogical TO {}").format(user),
+                # Grant EXECUTE on all functions in the pglogical schema
+                sql.SQL("GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA pglogical TO {}").format(user),
+            ]
+
+            # Send every grant in a single round-trip to the server
+            cursor.execute(sql.SQL(";\n").join(grants))
 
         self.stdout.write(self.style.SUCCESS(f'Replication user "{username}" created with necessary privileges.'))
\ No newline at end of file
@@ -109,6 +109,12 @@ TEMPLATES: List[Dict[str, Any]] = [
 WSGI_APPLICATION = 'mcp_nexus.wsgi.application'
 ASGI_APPLICATION = 'mcp_nexus.asgi.application'
 
+# Keep database connections open between requests instead of reconnecting
+# on every one. Set to 0 when running behind a transaction-pooling pgbouncer.
+# Persistent connections are pinged before reuse, so a connection the server
+# dropped while idle doesn't fail the next request or task.
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+
 if 'RDS_HOSTNAME' in os.environ:
     # Running on AWS Elastic Beanstalk
     DATABASES = {
@@ -119,6 +125,8 @@ if 'RDS_HOSTNAME' in os.environ:
             'PASSWORD': os.environ['RDS_PASSWORD'],
             'HOST': os.environ['RDS_HOSTNAME'],
             'PORT': os.environ['RDS_PORT'],
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
         }
     }
 else:
@@ -131,6 +139,8 @@ else:
             'PASSWORD': os.environ.get('DB_PASSWORD', 'postgres'),
             'HOST': os.environ.get('DB_HOST', 'localhost'),
             'PORT': os.environ.get('DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
         }
     }
 
@@ -151,6 +161,12 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+# Webhook deliveries wait on other people's servers, so they get their own
+# queue and workers (see the celery-webhooks service) and can't hold up other tasks
+CELERY_TASK_ROUTES = {
+    'webhooks.tasks.process_webhook_delivery': {'queue': 'webhooks'},
+    'webhooks.tasks.process_webhook_delivery_batch': {'queue': 'webhooks'},
+}
 
 # Channels Configuration
 CHANNEL_LAYERS = { # type: ignore
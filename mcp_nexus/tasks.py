@@ -0,0 +1,33 @@
+import logging
+from celery import shared_task
+from django.db import connection
+from mcp_nexus.management import _pglogical
+
+logger = logging.getLogger('mcp_nexus')
+
+@shared_task
+def setup_subscription(remote_node_name):
+    """
+    Create a pglogical subscription to a remote node.
+
+    Runs on a Celery worker so container start-up doesn't block while the
+    subscription connects to the provider and starts the initial sync. The
+    provider DSN, which carries the replication password, is read from the
+    worker's environment rather than passed through the broker.
+    """
+    remote_dsn = _pglogical.pglogical_env()['remote_dsn']
+    if not remote_dsn:
+        logger.error(f"PGLOGICAL_REMOTE_DSN is not set; can't subscribe to {remote_node_name}.")
+        return
+
+    subscription_name = f"sub_from_{remote_node_name}"
+
+    with connection.cursor() as cursor:
+        logger.info(f"Attempting subscription to remote node: {remote_node_name}")
+        try:
+            if _pglogical.create_subscription(cursor, subscription_name, remote_dsn):
+                logger.info(f"Subscription to {remote_node_name} created.")
+            else:
+                logger.warning(f"Subscription to {remote_node_name} already exists. Skipping.")
+        except Exception as e:
+            logger.warning(f"Failed to create subscription to {remote_node_name}. Skipping.\n{e}")
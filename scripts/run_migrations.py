@@ -1,48 +1,114 @@
 #!/usr/bin/env python
-import time
-import subprocess
+import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Run every management command in this process instead of spawning
+# `manage.py` repeatedly, so Django is only set up once.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mcp_nexus.settings')
+
+import django
+import psycopg2
+
+django.setup()
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connections
+
+# Digest of the static files collected at image build time (see Dockerfile).
+STATICFILES_DIGEST = Path(__file__).resolve().parent.parent / '.staticfiles.sha'
+
 
-# Wait for database to be ready
-max_retries = 10
-retry_count = 0
-while retry_count < max_retries:
+def run_steps(*steps):
+    """Run (message, command, options) steps in order on the calling thread."""
     try:
-        print("Checking if database is ready...")
-        subprocess.check_call(["python", "manage.py", "check", "--database", "default"])
-        print("Database is ready!")
-        break
-    except subprocess.CalledProcessError:
-        retry_count += 1
-        print(f"Database not ready yet (attempt {retry_count}/{max_retries}), waiting...")
-        time.sleep(5)
-
-if retry_count == max_retries:
-    print("Could not connect to database after maximum retries. Exiting.")
-    sys.exit(1)
+        for message, command, options in steps:
+            print(message)
+            call_command(command, **options)
+    finally:
+        # Each thread opens its own connections; don't leave them dangling.
+        connections.close_all()
+
+
+def collect_static():
+    """Run collectstatic unless STATIC_ROOT already holds this image's files."""
+    collected_digest = Path(settings.STATIC_ROOT) / STATICFILES_DIGEST.name
+    try:
+        if STATICFILES_DIGEST.read_bytes() == collected_digest.read_bytes():
+            print("Static files are up to date, skipping collectstatic.")
+            return
+    except FileNotFoundError:
+        pass
 
-# Run migrations
-print("Running migrations...")
-subprocess.check_call(["python", "manage.py", "migrate", "--noinput"])
+    print("Collecting static files...")
+    call_command("collectstatic", interactive=False)
+    if STATICFILES_DIGEST.exists():
+        collected_digest.write_bytes(STATICFILES_DIGEST.read_bytes())
 
-# Create superuser if needed
-print("Ensuring superuser exists...")
-subprocess.check_call(["python", "manage.py", "ensure_superuser"])
 
-# Setup pglogical
-print("Setting up pglogical...")
-subprocess.check_call(["python", "manage.py", "setup_pglogical"])
+def wait_for_database(timeout=60):
+    """
+    Poll the default database with a bare psycopg2 connection until it accepts
+    connections, backing off from 0.25s up to 2s between attempts.
+    """
+    db = settings.DATABASES['default']
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        try:
+            print("Checking if database is ready...")
+            conn = psycopg2.connect(
+                dbname=db['NAME'],
+                user=db['USER'],
+                password=db['PASSWORD'],
+                host=db['HOST'],
+                port=db['PORT'],
+                connect_timeout=1,
+            )
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            finally:
+                conn.close()
+            print("Database is ready!")
+            return True
+        except psycopg2.OperationalError:
+            if time.monotonic() >= deadline:
+                return False
+            attempt += 1
+            print(f"Database not ready yet (attempt {attempt}), waiting...")
+            time.sleep(min(0.25 * 2 ** (attempt - 1), 2.0))
+
+
+if not wait_for_database():
+    print("Could not connect to database before the deadline. Exiting.")
+    sys.exit(1)
+
+with ThreadPoolExecutor(max_workers=3) as executor:
+    # Collecting static files only touches the filesystem, so it can run
+    # alongside everything that talks to the database.
+    static_files = executor.submit(collect_static)
 
-# Create repuser
-print("Creating replication user...")
-subprocess.check_call(["python", "manage.py", "create_repuser"])
+    # Everything else needs the schema in place first.
+    run_steps(("Running migrations...", "migrate", {"interactive": False}))
 
-# Subscribe to pglogical
-print("Subscribing to pglogical...")
-subprocess.check_call(["python", "manage.py", "subscribe_pglogical"])
+    superuser = executor.submit(
+        run_steps,
+        ("Ensuring superuser exists...", "ensure_superuser", {}),
+    )
+    replication = executor.submit(
+        run_steps,
+        ("Setting up pglogical...", "setup_pglogical", {}),
+        ("Creating replication user...", "create_repuser", {}),
+        ("Queueing pglogical subscription...", "subscribe_pglogical", {"enqueue": True}),
+    )
 
-# Collect static files
-print("Collecting static files...")
-subprocess.check_call(["python", "manage.py", "collectstatic", "--noinput"])
+    # Re-raise the first failure, if any, so the container exits non-zero.
+    for future in (static_files, superuser, replication):
+        future.result()
 
 print("All migration and static collection tasks completed successfully!")
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ServersConfig(AppConfig):
+    name = 'servers'
+
+    def ready(self):
+        from . import signals  # noqa: F401
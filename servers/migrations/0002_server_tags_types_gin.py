@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:28
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='server',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='servers_ser_tags_99234c_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['types'], name='servers_ser_types_f04a7c_gin'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:28
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0002_server_tags_types_gin'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='server',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('name', 'description', 'provider', config='english'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='server',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='servers_ser_search__bfacf4_gin'),
+        ),
+    ]
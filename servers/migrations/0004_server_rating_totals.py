@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0003_server_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='server',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='rating_sum',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE servers_server AS s
+                SET rating_sum = r.total, rating_count = r.n
+                FROM (
+                    SELECT server_id, SUM(rating) AS total, COUNT(*) AS n
+                    FROM servers_serverrating
+                    GROUP BY server_id
+                ) AS r
+                WHERE r.server_id = s.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0004_server_rating_totals'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='serverrating',
+            name='servers_ser_server__2827bd_idx',
+        ),
+        migrations.AddIndex(
+            model_name='serverrating',
+            index=models.Index(fields=['server', '-created_at'], name='servers_ser_server__90588a_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0005_serverrating_server_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='server',
+            name='verification_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('valid', 'Valid'), ('invalid', 'Invalid')], default='pending', max_length=10),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:31
+
+from django.db import migrations, models
+
+
+# Postgres can't cast uuid to bigint, so AlterField alone won't do. Give each
+# table a new identity column, carry the parameter -> capability links over
+# to it, then drop the UUID columns and put back what dropping them removed
+# (primary keys, the parameter FK, its indexes and unique constraint).
+FORWARDS_SQL = """
+ALTER TABLE servers_servercapability ADD COLUMN new_id bigint GENERATED BY DEFAULT AS IDENTITY;
+
+ALTER TABLE servers_capabilityparameter ADD COLUMN new_capability_id bigint;
+UPDATE servers_capabilityparameter AS p
+SET new_capability_id = c.new_id
+FROM servers_servercapability AS c
+WHERE p.capability_id = c.id;
+
+ALTER TABLE servers_capabilityparameter DROP COLUMN capability_id;
+ALTER TABLE servers_capabilityparameter RENAME COLUMN new_capability_id TO capability_id;
+ALTER TABLE servers_capabilityparameter ALTER COLUMN capability_id SET NOT NULL;
+
+ALTER TABLE servers_servercapability DROP COLUMN id;
+ALTER TABLE servers_servercapability RENAME COLUMN new_id TO id;
+ALTER TABLE servers_servercapability ADD PRIMARY KEY (id);
+
+ALTER TABLE servers_capabilityparameter DROP COLUMN id;
+ALTER TABLE servers_capabilityparameter ADD COLUMN id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY;
+
+ALTER TABLE servers_capabilityparameter
+    ADD CONSTRAINT servers_capabilityparameter_capability_id_fk
+    FOREIGN KEY (capability_id) REFERENCES servers_servercapability (id)
+    DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX servers_capabilityparameter_capability_id ON servers_capabilityparameter (capability_id);
+CREATE INDEX servers_cap_capabil_92d7dd_idx ON servers_capabilityparameter (capability_id);
+ALTER TABLE servers_capabilityparameter
+    ADD CONSTRAINT servers_capabilityparameter_capability_id_name_uniq UNIQUE (capability_id, name);
+
+ALTER TABLE servers_serverrating DROP COLUMN id;
+ALTER TABLE servers_serverrating ADD COLUMN id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0006_server_verification_status'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(FORWARDS_SQL),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='capabilityparameter',
+                    name='id',
+                    field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+                ),
+                migrations.AlterField(
+                    model_name='servercapability',
+                    name='id',
+                    field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+                ),
+                migrations.AlterField(
+                    model_name='serverrating',
+                    name='id',
+                    field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0007_bigint_ids_for_child_tables'),
+        ('verification', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='server',
+            name='total_count_30d',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='server',
+            name='up_count_30d',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE servers_server AS s
+                SET total_count_30d = c.total, up_count_30d = c.up
+                FROM (
+                    SELECT server_id, COUNT(*) AS total, COUNT(*) FILTER (WHERE is_up) AS up
+                    FROM verification_healthcheck
+                    WHERE created_at >= now() - interval '30 days'
+                    GROUP BY server_id
+                ) AS c
+                WHERE c.server_id = s.id;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
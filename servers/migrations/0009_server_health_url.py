@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0008_server_health_check_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='server',
+            name='health_url',
+            field=models.CharField(default='', editable=False, max_length=200),
+        ),
+        migrations.RunSQL(
+            sql="UPDATE servers_server SET health_url = rtrim(url, '/');",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0009_server_health_url'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='server',
+            name='domain',
+            field=models.CharField(default='', editable=False, max_length=253),
+        ),
+        # Same as urlparse(url).netloc: everything between the scheme and
+        # the first /, ? or #
+        migrations.RunSQL(
+            sql=r"""
+                UPDATE servers_server
+                SET domain = coalesce(substring(url from '^[A-Za-z][A-Za-z0-9+.-]*://([^/?#]*)'), '');
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,11 +1,18 @@
 import uuid
 from django.db import models
+from django.db.models import Avg, Count, F, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, Greatest
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
-from django.utils.text import slugify
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from common.utils import bump_cache_version
 
 User = get_user_model()
 
+# Cache namespace for server list pages; bumped by servers.signals on writes.
+SERVER_LIST_CACHE = 'servers:list'
+
 class Server(models.Model):
     """
     Model representing an MCP server registered in the system.
@@ -16,6 +23,12 @@ class Server(models.Model):
         ('tool', 'Tool'),
     ]
 
+    VERIFICATION_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('valid', 'Valid'),
+        ('invalid', 'Invalid'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
     slug = models.SlugField(max_length=255, unique=True)
@@ -23,6 +36,12 @@ class Server(models.Model):
     provider = models.CharField(max_length=255)
 
     url = models.URLField()
+    # url without its trailing slash, as health checks request it; kept in
+    # step by servers.signals
+    health_url = models.CharField(max_length=200, editable=False, default='')
+    # Host part of url, as DNS verification looks it up; also kept in step by
+    # servers.signals
+    domain = models.CharField(max_length=253, editable=False, default='')
     documentation_url = models.URLField(blank=True, null=True)
 
     types = ArrayField(
@@ -42,10 +61,23 @@ class Server(models.Model):
 
     # Server verification status
     verified = models.BooleanField(default=False)
+    # Whether the URL answered the initial verification probe; set by
+    # verification.tasks.initiate_verification after registration
+    verification_status = models.CharField(
+        max_length=10,
+        choices=VERIFICATION_STATUS_CHOICES,
+        default='pending'
+    )
 
-    # Rating and usage stats
+    # Rating and usage stats; rating is rating_sum / rating_count, kept in
+    # step by servers.signals
     rating = models.FloatField(default=0.0)
+    rating_sum = models.BigIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
     uptime = models.FloatField(default=100.0)  # Percentage
+    # Health checks over the last 30 days; uptime is up / total
+    up_count_30d = models.PositiveIntegerField(default=0)
+    total_count_30d = models.PositiveIntegerField(default=0)
     usage_count = models.PositiveIntegerField(default=0)
 
     # Metadata
@@ -65,15 +97,16 @@ class Server(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Full-text search document, kept up to date by Postgres itself
+    search_vector = models.GeneratedField(
+        expression=SearchVector('name', 'description', 'provider', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        """Generate a slug from the name if one isn't provided."""
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
-
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -81,6 +114,10 @@ class Server(models.Model):
             models.Index(fields=['owner']),
             models.Index(fields=['verified']),
             models.Index(fields=['created_at']),
+            # Serve the types/tags __contains (@>) filters
+            GinIndex(fields=['tags']),
+            GinIndex(fields=['types']),
+            GinIndex(fields=['search_vector']),
         ]
 
 
@@ -94,7 +131,6 @@ class ServerCapability(models.Model):
         ('tool', 'Tool'),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     server = models.ForeignKey(Server, on_delete=models.CASCADE, related_name='capabilities')
 
     name = models.CharField(max_length=255)
@@ -126,7 +162,6 @@ class CapabilityParameter(models.Model):
     """
     Model representing a parameter for an MCP server capability.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     capability = models.ForeignKey(ServerCapability, on_delete=models.CASCADE, related_name='parameters')
 
     name = models.CharField(max_length=100)
@@ -180,7 +215,6 @@ class ServerRating(models.Model):
     """
     Model representing a user rating of an MCP server.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     server = models.ForeignKey(Server, on_delete=models.CASCADE, related_name='ratings')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='server_ratings')
 
@@ -193,21 +227,42 @@ class ServerRating(models.Model):
     def __str__(self):
         return f"{self.server.name} - {self.user.email} - {self.rating}"
 
-    def save(self, *args, **kwargs):
-        """Update the server's average rating when a new rating is added."""
-        super().save(*args, **kwargs)
-
-        # Update the server's average rating
-        ratings = self.server.ratings.all()
-        if ratings.exists():
-            self.server.rating = sum([r.rating for r in ratings]) / ratings.count()
-            self.server.save(update_fields=['rating'])
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored rating so an update only applies the difference.
+        instance._loaded_rating = instance.__dict__.get('rating')
+        return instance
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['server']),
+            models.Index(fields=['server', '-created_at']),
             models.Index(fields=['user']),
             models.Index(fields=['rating']),
         ]
-        unique_together = ['server', 'user']
\ No newline at end of file
+        unique_together = ['server', 'user']
+
+
+def apply_rating_delta(server_id, sum_delta, count_delta):
+    """Adjust a server's rating totals and average in one UPDATE."""
+    rating_sum = F('rating_sum') + sum_delta
+    rating_count = F('rating_count') + count_delta
+    Server.objects.filter(pk=server_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=Cast(rating_sum, FloatField()) / Greatest(rating_count, 1),
+    )
+    # Queryset updates send no signals, so drop cached list pages here
+    bump_cache_version(SERVER_LIST_CACHE)
+
+
+def recount_ratings(server_id):
+    """Recompute a server's rating totals from its ratings in one UPDATE."""
+    ratings = ServerRating.objects.filter(server=OuterRef('pk')).order_by().values('server')
+    Server.objects.filter(pk=server_id).update(
+        rating_sum=Coalesce(Subquery(ratings.annotate(total=Sum('rating')).values('total')), 0),
+        rating_count=Coalesce(Subquery(ratings.annotate(total=Count('pk')).values('total')), 0),
+        rating=Coalesce(Subquery(ratings.annotate(average=Avg('rating')).values('average')), 0.0),
+    )
+    bump_cache_version(SERVER_LIST_CACHE)
@@ -1,6 +1,96 @@
 from rest_framework import serializers
-from django.utils.text import slugify
-from .models import Server, ServerCapability, CapabilityParameter, UsageRequirements, ServerRating
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import (
+    Server, ServerCapability, CapabilityParameter, UsageRequirements, ServerRating,
+    apply_rating_delta, recount_ratings,
+)
+
+
+def create_capabilities(server, capabilities_data):
+    """Insert a server's capabilities and all their parameters with two bulk INSERTs."""
+    capabilities = []
+    parameters = []
+    for capability_data in capabilities_data:
+        parameters_data = capability_data.pop('parameters', [])
+        capability = ServerCapability(server=server, **capability_data)
+        capabilities.append(capability)
+        parameters.extend(
+            CapabilityParameter(capability=capability, **param_data)
+            for param_data in parameters_data
+        )
+
+    # Postgres returns the new capability ids from the first INSERT, and the
+    # parameters pick them up before the second one.
+    ServerCapability.objects.bulk_create(capabilities)
+    CapabilityParameter.objects.bulk_create(parameters)
+
+def _assign_changed(obj, data, fields):
+    """Copy the given fields from data onto obj; return True if any value changed."""
+    changed = False
+    for field in fields:
+        if field in data and getattr(obj, field) != data[field]:
+            setattr(obj, field, data[field])
+            changed = True
+    return changed
+
+
+def sync_capabilities(server, capabilities_data):
+    """
+    Make a server's capabilities match capabilities_data, matching
+    capabilities by name and parameters by (capability, name), and only
+    write the rows that were added, changed or removed.
+    """
+    capability_fields = ['description', 'type', 'examples']
+    parameter_fields = ['description', 'type', 'required', 'default']
+    now = timezone.now()
+
+    existing = {capability.name: capability for capability in server.capabilities.prefetch_related('parameters')}
+    new_capabilities, changed_capabilities = [], []
+    new_parameters, changed_parameters, removed_parameter_ids = [], [], []
+
+    for capability_data in capabilities_data:
+        parameters_data = capability_data.pop('parameters', [])
+        capability = existing.pop(capability_data['name'], None)
+
+        if capability is None:
+            capability = ServerCapability(server=server, **capability_data)
+            new_capabilities.append(capability)
+            new_parameters.extend(
+                CapabilityParameter(capability=capability, **param_data)
+                for param_data in parameters_data
+            )
+            continue
+
+        if _assign_changed(capability, capability_data, capability_fields):
+            capability.updated_at = now
+            changed_capabilities.append(capability)
+
+        parameters = {parameter.name: parameter for parameter in capability.parameters.all()}
+        for param_data in parameters_data:
+            parameter = parameters.pop(param_data['name'], None)
+            if parameter is None:
+                new_parameters.append(CapabilityParameter(capability=capability, **param_data))
+            elif _assign_changed(parameter, param_data, parameter_fields):
+                parameter.updated_at = now
+                changed_parameters.append(parameter)
+        removed_parameter_ids.extend(parameter.pk for parameter in parameters.values())
+
+    # Whatever is left in existing wasn't in the payload; parameters cascade.
+    if existing:
+        ServerCapability.objects.filter(pk__in=[c.pk for c in existing.values()]).delete()
+    if removed_parameter_ids:
+        CapabilityParameter.objects.filter(pk__in=removed_parameter_ids).delete()
+
+    # bulk_update skips auto_now, hence updated_at is set above and listed here.
+    if changed_capabilities:
+        ServerCapability.objects.bulk_update(changed_capabilities, capability_fields + ['updated_at'])
+    if changed_parameters:
+        CapabilityParameter.objects.bulk_update(changed_parameters, parameter_fields + ['updated_at'])
+
+    ServerCapability.objects.bulk_create(new_capabilities)
+    CapabilityParameter.objects.bulk_create(new_parameters)
+
 
 class CapabilityParameterSerializer(serializers.ModelSerializer):
     """Serializer for capability parameters."""
@@ -20,9 +110,10 @@ class ServerCapabilitySerializer(serializers.ModelSerializer):
         """Create capability with nested parameters."""
         parameters_data = validated_data.pop('parameters', [])
         capability = ServerCapability.objects.create(**validated_data)
-
-        for param_data in parameters_data:
-            CapabilityParameter.objects.create(capability=capability, **param_data)
+        CapabilityParameter.objects.bulk_create(
+            CapabilityParameter(capability=capability, **param_data)
+            for param_data in parameters_data
+        )
 
         return capability
 
@@ -34,20 +125,16 @@ class UsageRequirementsSerializer(serializers.ModelSerializer):
 
 class ServerRatingSerializer(serializers.ModelSerializer):
     """Serializer for server ratings."""
-    user_email = serializers.SerializerMethodField()
+    user_email = serializers.EmailField(source='user.email', read_only=True)
 
     class Meta:
         model = ServerRating
         fields = ['id', 'rating', 'review', 'user_email', 'created_at']
         read_only_fields = ['id', 'user_email', 'created_at']
 
-    def get_user_email(self, obj):
-        """Get the email of the user who created the rating."""
-        return obj.user.email
-
 class ServerSummarySerializer(serializers.ModelSerializer):
     """Serializer for server summaries (used in list views)."""
-    logo_url = serializers.SerializerMethodField()
+    logo_url = serializers.ImageField(source='logo', use_url=True, read_only=True)
 
     class Meta:
         model = Server
@@ -58,14 +145,6 @@ class ServerSummarySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'verified', 'created_at', 'updated_at', 'rating', 'uptime']
 
-    def get_logo_url(self, obj):
-        """Get the URL of the server logo."""
-        if obj.logo:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.logo.url)
-        return None
-
 class ServerRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for server registration."""
     capabilities = ServerCapabilitySerializer(many=True, required=False)
@@ -83,25 +162,13 @@ class ServerRegistrationSerializer(serializers.ModelSerializer):
             'slug': {'required': False},
         }
 
-    def validate_url(self, value):
-        """Validate that the URL is a valid MCP server."""
-        from common.utils import validate_mcp_server_url
-
-        valid, response = validate_mcp_server_url(value)
-        if not valid:
-            raise serializers.ValidationError(f"URL does not point to a valid MCP server: {response['error']}")
-        return value
-
+    @transaction.atomic
     def create(self, validated_data):
         """Create a server with nested capabilities and usage requirements."""
         contact_email = validated_data.pop('contact_email', None)
         capabilities_data = validated_data.pop('capabilities', [])
         usage_requirements_data = validated_data.pop('usage_requirements', None)
 
-        # Generate slug if not provided
-        if not validated_data.get('slug'):
-            validated_data['slug'] = slugify(validated_data['name'])
-
         # Set the owner to the current user
         validated_data['owner'] = self.context['request'].user
 
@@ -109,12 +176,7 @@ class ServerRegistrationSerializer(serializers.ModelSerializer):
         server = Server.objects.create(**validated_data)
 
         # Create capabilities
-        for capability_data in capabilities_data:
-            parameters_data = capability_data.pop('parameters', [])
-            capability = ServerCapability.objects.create(server=server, **capability_data)
-
-            for param_data in parameters_data:
-                CapabilityParameter.objects.create(capability=capability, **param_data)
+        create_capabilities(server, capabilities_data)
 
         # Create usage requirements
         if usage_requirements_data:
@@ -136,29 +198,26 @@ class ServerUpdateSerializer(serializers.ModelSerializer):
             'contact_email'
         ]
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         """Update a server with nested capabilities and usage requirements."""
         capabilities_data = validated_data.pop('capabilities', None)
         usage_requirements_data = validated_data.pop('usage_requirements', None)
+        validated_data.pop('contact_email', None)
 
-        # Update the server fields
+        # Update the server fields, writing only the columns that were sent
         for key, value in validated_data.items():
             setattr(instance, key, value)
 
-        instance.save()
+        update_fields = [*validated_data, 'updated_at']
+        if 'url' in validated_data:
+            update_fields += ['health_url', 'domain']
+        instance.save(update_fields=update_fields)
 
         # Update capabilities if provided
         if capabilities_data is not None:
-            # Delete existing capabilities
-            instance.capabilities.all().delete()
-
-            # Create new capabilities
-            for capability_data in capabilities_data:
-                parameters_data = capability_data.pop('parameters', [])
-                capability = ServerCapability.objects.create(server=instance, **capability_data)
-
-                for param_data in parameters_data:
-                    CapabilityParameter.objects.create(capability=capability, **param_data)
+            # Only write the capabilities and parameters that changed
+            sync_capabilities(instance, capabilities_data)
 
         # Update usage requirements if provided
         if usage_requirements_data is not None:
@@ -166,7 +225,7 @@ class ServerUpdateSerializer(serializers.ModelSerializer):
                 # Update existing usage requirements
                 for key, value in usage_requirements_data.items():
                     setattr(instance.usage_requirements, key, value)
-                instance.usage_requirements.save()
+                instance.usage_requirements.save(update_fields=[*usage_requirements_data, 'updated_at'])
             else:
                 # Create new usage requirements
                 UsageRequirements.objects.create(server=instance, **usage_requirements_data)
@@ -177,7 +236,7 @@ class ServerDetailSerializer(serializers.ModelSerializer):
     """Serializer for server details."""
     capabilities = ServerCapabilitySerializer(many=True, read_only=True)
     usage_requirements = UsageRequirementsSerializer(read_only=True)
-    logo_url = serializers.SerializerMethodField()
+    logo_url = serializers.ImageField(source='logo', use_url=True, read_only=True)
     owner_email = serializers.SerializerMethodField()
     status = serializers.SerializerMethodField()
 
@@ -185,26 +244,19 @@ class ServerDetailSerializer(serializers.ModelSerializer):
         model = Server
         fields = [
             'id', 'name', 'slug', 'description', 'provider', 'url', 'documentation_url',
-            'types', 'tags', 'logo_url', 'verified', 'rating', 'uptime', 'usage_count',
+            'types', 'tags', 'logo_url', 'verified', 'verification_status', 'rating', 'uptime', 'usage_count',
             'version', 'capabilities', 'protocols', 'usage_requirements', 'owner_email',
             'is_active', 'last_checked', 'status', 'created_at', 'updated_at'
         ]
         read_only_fields = fields
 
-    def get_logo_url(self, obj):
-        """Get the URL of the server logo."""
-        if obj.logo:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.logo.url)
-        return None
-
     def get_owner_email(self, obj):
         """Get the email of the server owner."""
         # Only return the owner email if the request user is the owner
         request = self.context.get('request')
-        if request and request.user == obj.owner:
-            return obj.owner.email
+        if request and obj.owner_id == request.user.id:
+            # Annotated by ServerViewSet.get_queryset; fall back to the relation.
+            return getattr(obj, 'owner_email', None) or obj.owner.email
         return None
 
     def get_status(self, obj):
@@ -215,6 +267,24 @@ class ServerDetailSerializer(serializers.ModelSerializer):
             'message': obj.status_message
         }
 
+# Insert or update a rating in one statement on the (server, user) unique
+# constraint. The new row is selected through a join on the CTE, so the
+# stored rating is locked and read before the write (FOR UPDATE sees the
+# latest committed value) and RETURNING reads it back from the CTE. xmax = 0
+# tells a fresh insert from an update, so the server's totals can be
+# adjusted without another query.
+RATING_UPSERT_SQL = """
+WITH previous AS (
+    SELECT rating FROM servers_serverrating
+    WHERE server_id = %s AND user_id = %s
+    FOR UPDATE
+)
+INSERT INTO servers_serverrating (server_id, user_id, rating, review, created_at, updated_at)
+SELECT %s, %s, %s, %s, %s, %s FROM (SELECT 1) AS new_rating LEFT JOIN previous ON true
+ON CONFLICT (server_id, user_id) DO UPDATE SET {updates}
+RETURNING id, review, created_at, (xmax = 0) AS inserted, (SELECT rating FROM previous)
+"""
+
 class ServerRatingCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating server ratings."""
     class Meta:
@@ -227,20 +297,38 @@ class ServerRatingCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Rating must be between 1 and 5")
         return value
 
+    @transaction.atomic
     def create(self, validated_data):
         """Create a rating, or update if one already exists from this user."""
         server = self.context['server']
         user = self.context['request'].user
-
-        # Check if the user has already rated this server
-        try:
-            rating = ServerRating.objects.get(server=server, user=user)
-            # Update existing rating
-            for key, value in validated_data.items():
-                setattr(rating, key, value)
-            rating.save()
-        except ServerRating.DoesNotExist:
-            # Create new rating
-            rating = ServerRating.objects.create(server=server, user=user, **validated_data)
-
-        return rating
\ No newline at end of file
+        now = timezone.now()
+
+        # Only overwrite what was sent, e.g. keep the old review
+        updates = ', '.join(f'{field} = EXCLUDED.{field}' for field in [*validated_data, 'updated_at'])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                RATING_UPSERT_SQL.format(updates=updates),
+                [
+                    server.pk, user.pk,
+                    server.pk, user.pk, validated_data['rating'], validated_data.get('review'), now, now,
+                ]
+            )
+            rating_id, review, created_at, inserted, previous = cursor.fetchone()
+
+        # The upsert sends no signals, so fold the change into the server's
+        # running totals here (which also drops cached list pages).
+        new_rating = validated_data['rating']
+        if inserted:
+            apply_rating_delta(server.pk, new_rating, 1)
+        elif previous is None:
+            # Lost a race with a concurrent first rating, so the previous
+            # value wasn't seen; recount rather than guess.
+            recount_ratings(server.pk)
+        elif previous != new_rating:
+            apply_rating_delta(server.pk, new_rating - previous, 0)
+
+        return ServerRating(
+            id=rating_id, server=server, user=user, rating=new_rating,
+            review=review, created_at=created_at, updated_at=now,
+        )
\ No newline at end of file
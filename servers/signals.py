@@ -0,0 +1,50 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils.text import slugify
+
+from common.utils import bump_cache_version, extract_domain_from_url
+from .models import SERVER_LIST_CACHE, Server, ServerRating, apply_rating_delta, recount_ratings
+
+
+@receiver(pre_save, sender=Server)
+def fill_server_slug(sender, instance, **kwargs):
+    """Generate a slug from the name if one isn't provided."""
+    if not instance.slug:
+        instance.slug = slugify(instance.name)
+
+
+@receiver(pre_save, sender=Server)
+def fill_server_url_fields(sender, instance, **kwargs):
+    """Derive the health check URL and the domain once, when the URL is written."""
+    instance.health_url = instance.url.rstrip('/')
+    instance.domain = extract_domain_from_url(instance.url)
+
+
+@receiver(post_save, sender=ServerRating)
+def add_rating_to_server(sender, instance, created, **kwargs):
+    """Fold a new or changed rating into the server's totals."""
+    if created:
+        apply_rating_delta(instance.server_id, instance.rating, 1)
+    else:
+        previous = getattr(instance, '_loaded_rating', None)
+        if previous is None:
+            # Old value unknown (deferred or never loaded): recount instead.
+            recount_ratings(instance.server_id)
+        elif previous != instance.rating:
+            apply_rating_delta(instance.server_id, instance.rating - previous, 0)
+    instance._loaded_rating = instance.rating
+
+
+@receiver(post_delete, sender=ServerRating)
+def remove_rating_from_server(sender, instance, **kwargs):
+    """Take a deleted rating back out of the server's totals."""
+    apply_rating_delta(instance.server_id, -instance.rating, -1)
+
+
+@receiver(post_save, sender=Server)
+@receiver(post_delete, sender=Server)
+@receiver(post_save, sender=ServerRating)
+@receiver(post_delete, sender=ServerRating)
+def invalidate_server_list_cache(sender, **kwargs):
+    """Drop cached server list pages whenever a server or its rating changes."""
+    bump_cache_version(SERVER_LIST_CACHE)
@@ -1,5 +1,8 @@
+from django.core.cache import cache
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import F, Prefetch, Q
 from rest_framework import viewsets, status, permissions, generics
 from rest_framework import filters as rest_filters
 from rest_framework.decorators import action
@@ -7,7 +10,9 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
-from .models import Server, ServerRating
+from common.pagination import NewestFirstCursorPagination
+from common.utils import request_cache_key
+from .models import SERVER_LIST_CACHE, Server, ServerCapability, ServerRating
 from .serializers import (
     ServerSummarySerializer,
     ServerRegistrationSerializer,
@@ -19,17 +24,36 @@ from .serializers import (
 
 from django_filters import rest_framework as filters
 
-class ServerFilter(filters.FilterSet):
-    types = filters.CharFilter(field_name='types', method='filter_array_field')
-    tags = filters.CharFilter(field_name='tags', method='filter_array_field')
+# Columns ServerSummarySerializer renders. List views load only these, which
+# leaves out the search_vector document and the detail-only columns.
+SUMMARY_COLUMNS = (
+    'id', 'name', 'slug', 'description', 'provider', 'types', 'tags',
+    'verified', 'created_at', 'updated_at', 'logo', 'rating', 'uptime',
+    'url', 'documentation_url',
+)
 
-    def filter_array_field(self, queryset, name, value):
-        lookup = f"{name}__contains"
-        return queryset.filter(**{lookup: [value]})
+# Query string values accepted as true for boolean filters
+TRUTHY_VALUES = frozenset({'true', '1', 'yes', 'on'})
 
+class ServerFilter(filters.FilterSet):
+    # Types and tags are filtered in ServerViewSet.get_queryset, which splits
+    # comma-separated tags and honours ?tags_match
     class Meta:
         model = Server
-        fields = ['types', 'tags', 'verified']
+        fields = ['verified']
+
+class ServerSearchFilter(rest_filters.SearchFilter):
+    """
+    Match ?search= against the indexed search_vector (name, description,
+    provider) or an exact tag, instead of ILIKE over every field.
+    """
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        query = SearchQuery(' '.join(terms), config='english')
+        return queryset.filter(Q(search_vector=query) | Q(tags__contains=terms))
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
     """
@@ -42,7 +66,7 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
 
         # Write permissions are only allowed to the owner
-        return obj.owner == request.user
+        return obj.owner_id == request.user.id
 
 @extend_schema_view(
     list=extend_schema(
@@ -74,10 +98,9 @@ class ServerViewSet(viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing server instances.
     """
-    filter_backends = [DjangoFilterBackend, rest_filters.SearchFilter, rest_filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ServerSearchFilter, rest_filters.OrderingFilter]
     # filterset_fields = ['types', 'tags', 'verified']
     filterset_class = ServerFilter
-    search_fields = ['name', 'description', 'provider', 'tags']
     ordering_fields = ['name', 'created_at', 'rating', 'uptime']
     ordering = ['-created_at']
     lookup_field = 'id'
@@ -97,35 +120,64 @@ class ServerViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.AllowAny]
         return [permission() for permission in permission_classes]
 
+    def list(self, request, *args, **kwargs):
+        """
+        List servers, caching each page for a minute. The list doesn't depend
+        on the user, and any server write moves the key to a new version.
+        """
+        cache_key = request_cache_key(SERVER_LIST_CACHE, request)
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(cache_key, response.data, 60)
+        return response
+
     def get_queryset(self):
         """
         Filter servers based on query parameters:
-        - type: Filter by server type
-        - tags: Filter by tags
+        - type (or types): Filter by server type
+        - tags: Filter by tags (all of them, or any with tags_match=any)
         - verified: Filter by verification status
         - search: Search by name, description, provider, and tags
         """
         queryset = Server.objects.all()
 
+        # The list only loads SUMMARY_COLUMNS. Retrieve and update render the
+        # detail shape, which walks capabilities -> parameters,
+        # usage_requirements and the owner's email; the other actions don't
+        # serialize those relations.
+        if self.action == 'list':
+            queryset = queryset.only(*SUMMARY_COLUMNS)
+        elif self.action in ('retrieve', 'update', 'partial_update'):
+            queryset = queryset.select_related('usage_requirements').prefetch_related(
+                Prefetch('capabilities', queryset=ServerCapability.objects.prefetch_related('parameters'))
+            ).annotate(owner_email=F('owner__email'))
+
         # Get query parameters
-        server_type = self.request.query_params.get('type')
+        server_type = self.request.query_params.get('type') or self.request.query_params.get('types')
         tags = self.request.query_params.get('tags')
         verified = self.request.query_params.get('verified')
 
-        # Apply filters
+        # Collect the filters and apply them in a single .filter() call
+        lookups = {}
         if server_type:
-            queryset = queryset.filter(types__contains=[server_type])
+            lookups['types__contains'] = [server_type]
 
         if tags:
-            tag_list = tags.split(',')
-            for tag in tag_list:
-                queryset = queryset.filter(tags__contains=[tag.strip()])
+            tag_list = [tag.strip() for tag in tags.split(',')]
+            # One array operator for the whole list: @> by default, or &&
+            # when ?tags_match=any asks for servers with any of the tags.
+            if self.request.query_params.get('tags_match') == 'any':
+                lookups['tags__overlap'] = tag_list
+            else:
+                lookups['tags__contains'] = tag_list
 
         if verified:
-            verified_bool = verified.lower() == 'true'
-            queryset = queryset.filter(verified=verified_bool)
+            lookups['verified'] = verified.lower() in TRUTHY_VALUES
 
-        return queryset
+        return queryset.filter(**lookups)
 
     def get_serializer_class(self):
         """
@@ -149,10 +201,11 @@ class ServerViewSet(viewsets.ModelViewSet):
         """Create a new server and perform initial verification checks."""
         serializer.save()
 
-        # Trigger verification task asynchronously
+        # Trigger verification task asynchronously, once the server row is
+        # committed so the worker can't look for it too early
         from verification.tasks import initiate_verification
-        server = serializer.instance
-        initiate_verification.delay(str(server.id))
+        server_ids = [str(serializer.instance.id)]
+        transaction.on_commit(lambda: initiate_verification.delay(server_ids))
 
     @action(detail=True, methods=['get'], permission_classes=[permissions.AllowAny])
     def ratings(self, request, id=None):
@@ -160,15 +213,13 @@ class ServerViewSet(viewsets.ModelViewSet):
         Get all ratings for a specific server.
         """
         server = self.get_object()
-        ratings = server.ratings.all()
-
-        page = self.paginate_queryset(ratings)
-        if page is not None:
-            serializer = ServerRatingSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        ratings = server.ratings.select_related('user')
 
-        serializer = ServerRatingSerializer(ratings, many=True)
-        return Response(serializer.data)
+        # Keyset pagination backed by the (server, -created_at) index
+        paginator = NewestFirstCursorPagination()
+        page = paginator.paginate_queryset(ratings, request, view=self)
+        serializer = ServerRatingSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def rate(self, request, id=None):
@@ -202,7 +253,7 @@ class ServerViewSet(viewsets.ModelViewSet):
 
         server.is_active = True
         server.status_message = "Activated by owner"
-        server.save()
+        server.save(update_fields=['is_active', 'status_message', 'updated_at'])
 
         # Trigger verification
         from verification.tasks import check_server_health
@@ -225,7 +276,7 @@ class ServerViewSet(viewsets.ModelViewSet):
 
         server.is_active = False
         server.status_message = request.data.get('message', "Deactivated by owner")
-        server.save()
+        server.save(update_fields=['is_active', 'status_message', 'updated_at'])
 
         return Response({"message": "Server deactivated"})
 
@@ -238,4 +289,4 @@ class UserServerListView(generics.ListAPIView):
 
     def get_queryset(self):
         """Return servers owned by the current user."""
-        return Server.objects.filter(owner=self.request.user)
\ No newline at end of file
+        return Server.objects.filter(owner=self.request.user).only(*SUMMARY_COLUMNS)
\ No newline at end of file
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0008_server_health_check_counters'),
+        ('verification', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='healthcheck',
+            name='verificatio_server__79f564_idx',
+        ),
+        migrations.AddIndex(
+            model_name='healthcheck',
+            index=models.Index(fields=['server', '-created_at', 'is_up'], name='hc_server_time_isup_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0008_server_health_check_counters'),
+        ('verification', '0002_healthcheck_server_time_isup_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='verificationrequest',
+            name='verificatio_verific_96cf33_idx',
+        ),
+        migrations.AlterField(
+            model_name='verificationrequest',
+            name='verification_token',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='verificationrequest',
+            index=models.Index(fields=['status'], name='verificatio_status_3cdd63_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='verificationrequest',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'in_progress'])), fields=('verification_token',), name='uniq_active_vtoken'),
+        ),
+    ]
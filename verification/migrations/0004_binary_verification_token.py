@@ -0,0 +1,57 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:48
+
+import base64
+
+from django.db import migrations, models
+
+
+def tokens_to_bytes(apps, schema_editor):
+    """Decode the existing URL-safe base64 tokens back to their raw bytes."""
+    VerificationRequest = apps.get_model('verification', 'VerificationRequest')
+    requests = VerificationRequest.objects.only('id', 'verification_token')
+    for request in requests.iterator(chunk_size=2000):
+        text = request.verification_token
+        request.token = base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+        request.save(update_fields=['token'])
+
+
+def tokens_to_text(apps, schema_editor):
+    VerificationRequest = apps.get_model('verification', 'VerificationRequest')
+    requests = VerificationRequest.objects.only('id', 'token')
+    for request in requests.iterator(chunk_size=2000):
+        text = base64.urlsafe_b64encode(bytes(request.token)).rstrip(b'=').decode()
+        request.verification_token = text
+        request.save(update_fields=['verification_token'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verification', '0003_active_verification_token_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='verificationrequest',
+            name='token',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.RunPython(tokens_to_bytes, tokens_to_text),
+        migrations.RemoveConstraint(
+            model_name='verificationrequest',
+            name='uniq_active_vtoken',
+        ),
+        migrations.RemoveField(
+            model_name='verificationrequest',
+            name='verification_token',
+        ),
+        migrations.AlterField(
+            model_name='verificationrequest',
+            name='token',
+            field=models.BinaryField(max_length=32),
+        ),
+        migrations.AddConstraint(
+            model_name='verificationrequest',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'in_progress'])), fields=('token',), name='uniq_active_vtoken'),
+        ),
+    ]
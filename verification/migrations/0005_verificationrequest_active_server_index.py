@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servers', '0009_server_health_url'),
+        ('verification', '0004_binary_verification_token'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='verificationrequest',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'in_progress'])), fields=['server'], name='vreq_active_server_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-15 23:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('verification', '0005_verificationrequest_active_server_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='verificationrequest',
+            name='verificatio_server__86fcbd_idx',
+        ),
+    ]
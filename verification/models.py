@@ -1,7 +1,12 @@
+import base64
+import secrets
 import uuid
 from django.db import models
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
 from django.utils import timezone
 from django.conf import settings
+from common.utils import bump_cache_version
 
 class VerificationRequest(models.Model):
     """
@@ -18,8 +23,9 @@ class VerificationRequest(models.Model):
     server = models.ForeignKey('servers.Server', on_delete=models.CASCADE, related_name='verification_requests')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
 
-    # Verification token for domain verification
-    verification_token = models.CharField(max_length=100, unique=True)
+    # Verification token for domain verification, stored as its 32 raw bytes;
+    # clients see the URL-safe base64 form via verification_token
+    token = models.BinaryField(max_length=32)
     verification_token_expiry = models.DateTimeField()
 
     # Verification method used
@@ -44,14 +50,18 @@ class VerificationRequest(models.Model):
     def __str__(self):
         return f"{self.server.name} Verification - {self.status}"
 
+    @property
+    def verification_token(self):
+        """The token as clients see it: unpadded URL-safe base64."""
+        return base64.urlsafe_b64encode(bytes(self.token)).rstrip(b'=').decode()
+
     def is_token_valid(self):
         """Check if the verification token is still valid."""
         return timezone.now() < self.verification_token_expiry
 
     def generate_verification_token(self):
         """Generate a new verification token."""
-        import secrets
-        self.verification_token = secrets.token_urlsafe(32)
+        self.token = secrets.token_bytes(32)
         self.verification_token_expiry = timezone.now() + settings.VERIFICATION_TOKEN_EXPIRY
         self.save()
         return self.verification_token
@@ -60,18 +70,38 @@ class VerificationRequest(models.Model):
         """Mark the verification request as completed."""
         self.status = 'completed' if success else 'failed'
         self.completed_at = timezone.now()
-        self.save()
+        self.save(update_fields=['status', 'completed_at', 'updated_at'])
 
         if success:
-            # Update server verified status
+            # Update server verified status with a narrow UPDATE, and keep
+            # the loaded server in step for whoever serializes it next
+            from servers.models import SERVER_LIST_CACHE, Server
+            Server.objects.filter(pk=self.server_id).update(verified=True, updated_at=self.completed_at)
             self.server.verified = True
-            self.server.save()
+            # Queryset updates send no signals, so drop cached list pages here
+            bump_cache_version(SERVER_LIST_CACHE)
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['server', 'status']),
-            models.Index(fields=['verification_token']),
+            models.Index(fields=['status']),
+            # Looking up a server's open request only has to search the few
+            # requests still awaiting proof. This replaces a (server, status)
+            # index; the FK index still covers a server's other requests.
+            models.Index(
+                fields=['server'],
+                condition=models.Q(status__in=['pending', 'in_progress']),
+                name='vreq_active_server_idx'
+            ),
+        ]
+        constraints = [
+            # Only requests still awaiting proof need a unique token, so the
+            # index leaves out the ever-growing tail of finished requests.
+            models.UniqueConstraint(
+                fields=['token'],
+                condition=models.Q(status__in=['pending', 'in_progress']),
+                name='uniq_active_vtoken'
+            ),
         ]
 
 
@@ -132,37 +162,54 @@ class HealthCheck(models.Model):
         return f"{self.server.name} Health Check - {'Up' if self.is_up else 'Down'}"
 
     def save(self, *args, **kwargs):
-        """Update server uptime statistics when a new health check is recorded."""
+        """Update server status when a new health check is recorded."""
         super().save(*args, **kwargs)
-
-        # Update server uptime percentage
-        # Calculate based on the last 30 days of health checks
-        thirty_days_ago = timezone.now() - timezone.timedelta(days=30)
-        recent_checks = HealthCheck.objects.filter(
-            server=self.server,
-            created_at__gte=thirty_days_ago
+        HealthCheck.apply_to_servers([self])
+
+    @staticmethod
+    def apply_to_servers(checks):
+        """
+        Reflect newly recorded health checks on their servers: flip servers
+        that went down or came back, stamp last_checked, and fold each check
+        into the server's 30-day counters and uptime. Uses narrow UPDATEs so
+        bulk-created checks can share it; expects one check per server.
+        """
+        from servers.models import SERVER_LIST_CACHE, Server
+
+        now = timezone.now()
+        up_ids = [check.server_id for check in checks if check.is_up]
+        down_ids = [check.server_id for check in checks if not check.is_up]
+
+        Server.objects.filter(id__in=down_ids, is_active=True).update(
+            is_active=False,
+            status_message="Down during automatic health check",
+            updated_at=now
+        )
+        Server.objects.filter(id__in=up_ids, is_active=False).update(
+            is_active=True,
+            status_message="Restored during automatic health check",
+            updated_at=now
         )
 
-        total_checks = recent_checks.count()
-        if total_checks > 0:
-            up_checks = recent_checks.filter(is_up=True).count()
-            uptime_percentage = (up_checks / total_checks) * 100
-
-            self.server.uptime = uptime_percentage
-            self.server.last_checked = self.created_at
-
-            if not self.is_up and self.server.is_active:
-                self.server.status_message = "Down during automatic health check"
-                self.server.is_active = False
-            elif self.is_up and not self.server.is_active:
-                self.server.status_message = "Restored during automatic health check"
-                self.server.is_active = True
+        # Count each check into the rolling window in O(1); the nightly
+        # rebuild_uptime_counters task drops checks older than 30 days.
+        total = F('total_count_30d') + 1
+        for server_ids, up in ((up_ids, 1), (down_ids, 0)):
+            Server.objects.filter(id__in=server_ids).update(
+                last_checked=now,
+                total_count_30d=total,
+                up_count_30d=F('up_count_30d') + up,
+                uptime=Cast(F('up_count_30d') + up, FloatField()) * 100 / total
+            )
 
-            self.server.save()
+        # Queryset updates send no signals, so drop cached list pages here
+        bump_cache_version(SERVER_LIST_CACHE)
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['server', '-created_at']),
+            # Covers the 30-day uptime count with an index-only scan, and
+            # the per-server history listing through its leading columns
+            models.Index(fields=['server', '-created_at', 'is_up'], name='hc_server_time_isup_idx'),
             models.Index(fields=['is_up']),
         ]
\ No newline at end of file
@@ -1,6 +1,26 @@
+import secrets
+
 from rest_framework import serializers
 from .models import VerificationRequest, VerificationCheck, HealthCheck
 
+# Instructions shown alongside a verification request, keyed by its status.
+_NEXT_STEPS = {
+    'pending': (
+        "To verify ownership of your server, please choose one of the verification methods "
+        "and provide the required proof. You can verify by adding a DNS TXT record, "
+        "uploading a verification file to your server, or adding a meta tag to your server's homepage."
+    ),
+    'in_progress': (
+        "We are currently verifying your server. This process usually takes a few minutes, "
+        "but can take up to 24 hours in some cases. You will be notified once the verification is complete."
+    ),
+    'completed': "Your server has been successfully verified. No further action is required.",
+    'failed': (
+        "Verification failed. Please review the check results for details on what went wrong, "
+        "make the necessary corrections, and try again."
+    ),
+}
+
 class VerificationCheckSerializer(serializers.ModelSerializer):
     """Serializer for verification checks."""
     class Meta:
@@ -25,42 +45,28 @@ class VerificationRequestSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Create a verification request and generate a verification token."""
-        import secrets
         from django.utils import timezone
         from django.conf import settings
 
         # Generate token and expiry before saving
-        verification_token = secrets.token_urlsafe(32)
+        token = secrets.token_bytes(32)
         verification_token_expiry = timezone.now() + settings.VERIFICATION_TOKEN_EXPIRY
 
         # Add token and expiry to validated data
-        validated_data['verification_token'] = verification_token
+        validated_data['token'] = token
         validated_data['verification_token_expiry'] = verification_token_expiry
 
         verification_request = VerificationRequest.objects.create(**validated_data)
-        verification_request.generate_verification_token()
-
-        # Create initial verification checks
-        VerificationCheck.objects.create(
-            verification_request=verification_request,
-            check_type='ownership',
-            status='pending'
-        )
-        VerificationCheck.objects.create(
-            verification_request=verification_request,
-            check_type='health',
-            status='pending'
-        )
-        VerificationCheck.objects.create(
-            verification_request=verification_request,
-            check_type='capabilities',
-            status='pending'
-        )
-        VerificationCheck.objects.create(
-            verification_request=verification_request,
-            check_type='security',
-            status='pending'
-        )
+
+        # Create initial verification checks in one INSERT
+        VerificationCheck.objects.bulk_create([
+            VerificationCheck(
+                verification_request=verification_request,
+                check_type=check_type,
+                status='pending'
+            )
+            for check_type, _ in VerificationCheck.CHECK_TYPE_CHOICES
+        ])
 
         return verification_request
 
@@ -80,24 +86,7 @@ class VerificationStatusSerializer(serializers.ModelSerializer):
 
     def get_next_steps(self, obj):
         """Get instructions for the next steps in verification."""
-        if obj.status == 'pending':
-            return (
-                "To verify ownership of your server, please choose one of the verification methods "
-                "and provide the required proof. You can verify by adding a DNS TXT record, "
-                "uploading a verification file to your server, or adding a meta tag to your server's homepage."
-            )
-        elif obj.status == 'in_progress':
-            return (
-                "We are currently verifying your server. This process usually takes a few minutes, "
-                "but can take up to 24 hours in some cases. You will be notified once the verification is complete."
-            )
-        elif obj.status == 'completed':
-            return "Your server has been successfully verified. No further action is required."
-        else:  # failed
-            return (
-                "Verification failed. Please review the check results for details on what went wrong, "
-                "make the necessary corrections, and try again."
-            )
+        return _NEXT_STEPS.get(obj.status, _NEXT_STEPS['failed'])
 
 class VerificationCompletionSerializer(serializers.Serializer):
     """Serializer for completing verification."""
@@ -107,37 +96,6 @@ class VerificationCompletionSerializer(serializers.Serializer):
     )
     verification_proof = serializers.CharField(required=True)
 
-class VerificationResultSerializer(serializers.ModelSerializer):
-    """Serializer for verification results."""
-    server_name = serializers.CharField(source='server.name', read_only=True)
-    verification_details = serializers.SerializerMethodField()
-    badge_url = serializers.SerializerMethodField()
-
-    class Meta:
-        model = VerificationRequest
-        fields = [
-            'id', 'server', 'server_name', 'status', 'created_at',
-            'completed_at', 'verification_details', 'badge_url'
-        ]
-        read_only_fields = fields
-
-    def get_verification_details(self, obj):
-        """Get details of the verification process."""
-        checks = obj.checks.all()
-        return {
-            'method': obj.verification_method,
-            'checks_passed': [check.check_type for check in checks if check.status == 'passed'],
-            'is_verified': obj.server.verified
-        }
-
-    def get_badge_url(self, obj):
-        """Get URL for the verification badge."""
-        if obj.server.verified:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(f'/api/v1/verification/badge/{obj.server.id}/')
-        return None
-
 class HealthCheckSerializer(serializers.ModelSerializer):
     """Serializer for health checks."""
     server_name = serializers.CharField(source='server.name', read_only=True)
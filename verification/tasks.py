@@ -1,55 +1,121 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 import requests
 from celery import shared_task
+from django.db.models import Count, F, FloatField, OuterRef, Q, Subquery
+from django.db.models.functions import Cast, Coalesce
+from django.core.cache import cache
 from django.utils import timezone
 from django.conf import settings
-from servers.models import Server
-from .models import HealthCheck
+from common.utils import build_http_session, bump_cache_version
+from servers.models import SERVER_LIST_CACHE, Server
+from .checks import run_checks
+from .models import HealthCheck, VerificationRequest
 
 logger = logging.getLogger('mcp_nexus')
 
+# Shared across tasks in a worker process so repeat checks reuse connections.
+# No adapter retries: each probe, and the HealthCheck row it produces, is
+# one attempt, and a dead host costs a single connect timeout.
+_SESSION = build_http_session(retries=0)
+
+# Servers probed per check_server_health_batch task, and threads per batch
+HEALTH_CHECK_BATCH_SIZE = 100
+HEALTH_CHECK_THREADS = 32
+
+# How long a verification run holds its per-server lock; a crashed worker's
+# lock lapses after this
+VERIFICATION_LOCK_TIMEOUT = 10 * 60
+
+# (connect, read) timeouts for a probe, so a slow handshake and a slow
+# response are bounded separately
+HEALTH_CHECK_TIMEOUT = (2.0, 3.0)
+
 @shared_task
-def initiate_verification(server_id):
+def initiate_verification(server_ids):
     """
-    Initiate the verification process for a newly registered server.
+    Initiate the verification process for newly registered servers.
+
+    Takes a list of server IDs so a batch of registrations costs one broker
+    message; a single ID string is still accepted.
     """
-    try:
-        server = Server.objects.get(id=server_id)
+    if isinstance(server_ids, str):
+        server_ids = [server_ids]
 
-        # Check if server exists and is accessible
+    servers = Server.objects.filter(id__in=server_ids)
+    found_ids = set()
+    for server in servers:
+        found_ids.add(str(server.id))
         try:
-            response = requests.get(f"{server.url.rstrip('/')}", timeout=5)
-            is_up = response.status_code == 200
-            response_time = response.elapsed.total_seconds()
+            _initiate_server_verification(server)
         except Exception as e:
-            logger.error(f"Error checking server health during initiation: {str(e)}", exc_info=True)
-            is_up = False
-            response_time = 0
-
-        # Record health check
-        HealthCheck.objects.create(
-            server=server,
-            is_up=is_up,
-            response_time=response_time,
-            details={"check_type": "initial_verification"}
-        )
+            logger.error(f"Error during verification initiation: {str(e)}", exc_info=True)
 
-        # If server is up, update status to active
-        if is_up:
-            server.is_active = True
-            server.status_message = "Server is active"
-            server.save()
-        else:
-            server.is_active = False
-            server.status_message = "Server is not responding"
-            server.save()
+    for server_id in set(map(str, server_ids)) - found_ids:
+        logger.error(f"Server not found for verification initiation: {server_id}")
 
-        logger.info(f"Initiated verification for server: {server.name} (ID: {server.id})")
 
-    except Server.DoesNotExist:
-        logger.error(f"Server not found for verification initiation: {server_id}")
+def _initiate_server_verification(server):
+    """
+    Probe a newly registered server and record the result.
+    """
+    # Check if server exists and is accessible
+    try:
+        response = _SESSION.get(server.health_url, timeout=5)
+        is_up = response.status_code == 200
+        response_time = response.elapsed.total_seconds()
     except Exception as e:
-        logger.error(f"Error during verification initiation: {str(e)}", exc_info=True)
+        logger.error(f"Error checking server health during initiation: {str(e)}", exc_info=True)
+        is_up = False
+        response_time = 0
+
+    # Record health check
+    HealthCheck.objects.create(
+        server=server,
+        is_up=is_up,
+        response_time=response_time,
+        details={"check_type": "initial_verification"}
+    )
+
+    # If server is up, update status to active
+    Server.objects.filter(pk=server.pk).update(
+        is_active=is_up,
+        verification_status='valid' if is_up else 'invalid',
+        status_message="Server is active" if is_up else "Server is not responding",
+        updated_at=timezone.now()
+    )
+    # Queryset updates send no signals, so drop cached list pages here
+    bump_cache_version(SERVER_LIST_CACHE)
+
+    logger.info(f"Initiated verification for server: {server.name} (ID: {server.id})")
+
+
+def _probe_server(url):
+    """
+    Request a server's health URL once and describe the result as HealthCheck fields.
+    """
+    try:
+        # Only the status code matters, so try HEAD first. Plenty of servers
+        # answer HEAD with 404, 400, 405 or 501 but serve GET fine, so fall
+        # back to GET whenever HEAD doesn't come back 200.
+        response = _SESSION.head(url, timeout=HEALTH_CHECK_TIMEOUT, allow_redirects=True)
+        if response.status_code != 200:
+            response = _SESSION.get(url, timeout=HEALTH_CHECK_TIMEOUT)
+        return {
+            'is_up': response.status_code == 200,
+            'response_time': response.elapsed.total_seconds(),
+            'status_code': response.status_code,
+            'error_message': None,
+        }
+    except requests.RequestException as e:
+        return {
+            'is_up': False,
+            'response_time': 0,
+            'status_code': None,
+            'error_message': str(e),
+        }
 
 
 @shared_task
@@ -58,52 +124,133 @@ def check_server_health(server_id):
     Check the health of a server and update its status.
     """
     try:
-        server = Server.objects.get(id=server_id)
+        # Only the probe URL and the name for the log line are needed
+        row = Server.objects.filter(pk=server_id).values_list('health_url', 'name').first()
+        if row is None:
+            logger.error(f"Server not found for health check: {server_id}")
+            return
+        health_url, name = row
 
-        try:
-            # Check if server is up
-            response = requests.get(f"{server.url.rstrip('/')}", timeout=5)
-            is_up = response.status_code == 200
-            response_time = response.elapsed.total_seconds()
-            status_code = response.status_code
-            error_message = None
-        except requests.RequestException as e:
-            is_up = False
-            response_time = 0
-            status_code = None
-            error_message = str(e)
-
-        # Record health check
-        HealthCheck.objects.create(
-            server=server,
-            is_up=is_up,
-            response_time=response_time,
-            status_code=status_code,
-            error_message=error_message,
-            details={"check_type": "scheduled"}
-        )
+        # Check if server is up
+        result = _probe_server(health_url)
 
-        logger.info(f"Health check for server {server.name}: {'UP' if is_up else 'DOWN'}")
+        # Record health check; saving it also updates the server's status
+        HealthCheck(
+            server_id=server_id,
+            details={"check_type": "scheduled"},
+            **result
+        ).save()
+
+        logger.info(f"Health check for server {name}: {'UP' if result['is_up'] else 'DOWN'}")
 
-    except Server.DoesNotExist:
-        logger.error(f"Server not found for health check: {server_id}")
     except Exception as e:
         logger.error(f"Error during server health check: {str(e)}", exc_info=True)
 
 
+@shared_task
+def check_server_health_batch(server_ids):
+    """
+    Check the health of a batch of servers concurrently within one task.
+
+    The probes are network-bound, so a thread pool sharing the pooled session
+    overlaps them instead of spending a Celery task per server.
+    """
+    servers = list(Server.objects.filter(id__in=server_ids).values_list('id', 'health_url'))
+    if not servers:
+        return
+
+    with ThreadPoolExecutor(max_workers=min(HEALTH_CHECK_THREADS, len(servers))) as executor:
+        results = list(executor.map(lambda server: _probe_server(server[1]), servers))
+
+    checks = [
+        HealthCheck(server_id=server_id, details={"check_type": "scheduled"}, **result)
+        for (server_id, _), result in zip(servers, results)
+    ]
+    HealthCheck.objects.bulk_create(checks, batch_size=500)
+    HealthCheck.apply_to_servers(checks)
+
+    up_count = sum(check.is_up for check in checks)
+    logger.info(f"Health checked {len(checks)} servers: {up_count} UP, {len(checks) - up_count} DOWN")
+
+
 @shared_task
 def run_scheduled_health_checks():
     """
     Run health checks for all active servers on a schedule.
     """
-    # Get all active servers that haven't been checked in the check interval
+    # Get all active servers that haven't been checked in the check interval,
+    # streaming the IDs so memory stays bounded by the batch size
     check_cutoff = timezone.now() - settings.VERIFICATION_CHECK_INTERVAL
-    servers_to_check = Server.objects.filter(
+    server_ids = Server.objects.filter(
         is_active=True,
         last_checked__lt=check_cutoff
+    ).values_list('id', flat=True).iterator(chunk_size=1000)
+
+    # Publish each batch as soon as it has been read
+    dispatched = 0
+    while batch := [str(server_id) for server_id in islice(server_ids, HEALTH_CHECK_BATCH_SIZE)]:
+        check_server_health_batch.delay(batch)
+        dispatched += len(batch)
+
+    logger.info(f"Running scheduled health checks for {dispatched} servers")
+
+
+@shared_task
+def rebuild_uptime_counters():
+    """
+    Rebuild every server's 30-day health check counters and uptime.
+
+    Health checks only ever add to the counters, so this nightly pass is what
+    lets checks older than 30 days fall out of the window.
+    """
+    thirty_days_ago = timezone.now() - timezone.timedelta(days=30)
+    window = HealthCheck.objects.filter(
+        server=OuterRef('pk'),
+        created_at__gte=thirty_days_ago
+    ).order_by().values('server')
+
+    Server.objects.update(
+        total_count_30d=Coalesce(Subquery(window.annotate(n=Count('id')).values('n')), 0),
+        up_count_30d=Coalesce(Subquery(window.annotate(n=Count('id', filter=Q(is_up=True))).values('n')), 0),
     )
+    # Servers with no recent checks keep their last known uptime
+    Server.objects.filter(total_count_30d__gt=0).update(
+        uptime=Cast(F('up_count_30d'), FloatField()) * 100 / F('total_count_30d')
+    )
+    bump_cache_version(SERVER_LIST_CACHE)
+
+
+@shared_task
+def run_verification(verification_id):
+    """
+    Run the checks for a verification request whose proof has been submitted.
 
-    logger.info(f"Running scheduled health checks for {servers_to_check.count()} servers")
+    A per-server lock in the cache keeps two runs for the same server from
+    probing it at once; a run that can't take the lock is dropped.
+    """
+    try:
+        verification_request = VerificationRequest.objects.select_related('server').get(
+            id=verification_id,
+            status='in_progress'
+        )
+    except VerificationRequest.DoesNotExist:
+        logger.error(f"No in-progress verification request to run: {verification_id}")
+        return
+
+    lock_key = f"verification:lock:{verification_request.server_id}"
+    if not cache.add(lock_key, verification_id, VERIFICATION_LOCK_TIMEOUT):
+        logger.info(f"Verification already running for server {verification_request.server_id}, skipping")
+        return
 
-    for server in servers_to_check:
-        check_server_health.delay(str(server.id))
\ No newline at end of file
+    try:
+        passed = run_checks(verification_request)
+        logger.info(f"Verification {verification_id}: {'passed' if passed else 'failed'}")
+    except Exception as e:
+        logger.error(f"Error during verification run: {str(e)}", exc_info=True)
+        # Don't leave the request stuck in progress
+        VerificationRequest.objects.filter(pk=verification_id, status='in_progress').update(
+            status='failed',
+            updated_at=timezone.now()
+        )
+    finally:
+        cache.delete(lock_key)
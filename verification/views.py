@@ -1,14 +1,18 @@
+import hashlib
 import logging
 import urllib.parse
-import requests
-import dns.resolver
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import status, permissions, generics, views
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema
-from common.utils import check_server_health, extract_domain_from_url
+from common.pagination import NewestFirstCursorPagination
 from servers.models import Server
 from servers.views import IsOwnerOrReadOnly
 from .models import VerificationRequest, VerificationCheck, HealthCheck
@@ -16,7 +20,6 @@ from .serializers import (
     VerificationRequestSerializer,
     VerificationStatusSerializer,
     VerificationCompletionSerializer,
-    VerificationResultSerializer,
     HealthCheckSerializer
 )
 
@@ -53,6 +56,8 @@ class RequestVerificationView(generics.CreateAPIView):
         ).first()
 
         if existing_request:
+            # Reuse the server already loaded for the permission check
+            existing_request.server = server
             serializer = self.get_serializer(existing_request)
 
             # Build the response with verification instructions
@@ -100,6 +105,11 @@ class VerificationStatusView(generics.RetrieveAPIView):
     serializer_class = VerificationStatusSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
 
+    def get_queryset(self):
+        # The owner check and server_name both read the server; checks are
+        # only prefetched when the response isn't served from cache
+        return VerificationRequest.objects.select_related('server')
+
     @extend_schema(
         summary="Check verification status",
         description="Check the status of a server verification request.",
@@ -112,13 +122,33 @@ class VerificationStatusView(generics.RetrieveAPIView):
     def get(self, request, *args, **kwargs):
         # Get the verification request
         verification_id = kwargs.get('verification_id')
-        verification_request = get_object_or_404(VerificationRequest, id=verification_id)
+        verification_request = get_object_or_404(self.get_queryset(), id=verification_id)
 
         # Check if the user is the server owner
         self.check_object_permissions(request, verification_request.server)
 
-        serializer = self.get_serializer(verification_request)
-        return Response(serializer.data)
+        # Clients poll this while verification runs. updated_at moves on
+        # every write, so it validates both their copy and ours without any
+        # explicit invalidation.
+        updated_at = verification_request.updated_at.timestamp()
+        etag = f'W/"{verification_request.id}:{updated_at}"'
+        last_modified = int(updated_at)
+
+        # A poll that already has the current state gets a bodyless 304
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            cache_key = f"verification:status:{verification_request.id}:{updated_at}"
+            data = cache.get(cache_key)
+            if data is None:
+                prefetch_related_objects([verification_request], 'checks')
+                data = self.get_serializer(verification_request).data
+                cache.set(cache_key, data, 300)
+            response = Response(data)
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
 
 
 class CompleteVerificationView(views.APIView):
@@ -129,10 +159,13 @@ class CompleteVerificationView(views.APIView):
 
     @extend_schema(
         summary="Complete verification",
-        description="Complete the verification process by providing necessary proof.",
+        description=(
+            "Submit the proof of ownership. The checks run in the background; "
+            "poll the status endpoint for the result."
+        ),
         request=VerificationCompletionSerializer,
         responses={
-            200: VerificationResultSerializer,
+            202: VerificationStatusSerializer,
             400: {"type": "object", "properties": {"error": {"type": "string"}}},
             401: {"type": "object", "properties": {"error": {"type": "string"}}},
             404: {"type": "object", "properties": {"error": {"type": "string"}}}
@@ -142,7 +175,7 @@ class CompleteVerificationView(views.APIView):
         # Get the verification request
         verification_id = kwargs.get('verification_id')
         verification_request = get_object_or_404(
-            VerificationRequest,
+            VerificationRequest.objects.select_related('server'),
             id=verification_id,
             status__in=['pending', 'in_progress']
         )
@@ -165,284 +198,23 @@ class CompleteVerificationView(views.APIView):
         verification_request.verification_method = serializer.validated_data['verification_method']
         verification_request.verification_proof = serializer.validated_data.get('verification_proof', '')
         verification_request.status = 'in_progress'
-        verification_request.save()
-
-        # Perform verification based on the chosen method
-        verification_successful = False
-        ownership_check = verification_request.checks.get(check_type='ownership')
-
-        if verification_request.verification_method == 'dns':
-            # DNS verification
-            domain = extract_domain_from_url(verification_request.server.url)
-            verification_successful = self._verify_dns(domain, verification_request.verification_token, ownership_check)
-        elif verification_request.verification_method == 'file':
-            # File verification
-            # url = f"{verification_request.server.url.rstrip('/')}/mcp-verification.txt"
-            url = f"https://raw.githubusercontent.com/aidecentralized/sample_server/refs/heads/main/mcp-verification.txt"
-            verification_successful = self._verify_file(url, verification_request.verification_token, ownership_check)
-        elif verification_request.verification_method == 'meta_tag':
-            # Meta tag verification
-            url = verification_request.server.url
-            verification_successful = self._verify_meta_tag(url, verification_request.verification_token, ownership_check)
-
-        # Update the ownership check
-        ownership_check.status = 'passed' if verification_successful else 'failed'
-        ownership_check.save()
-
-        if verification_successful:
-            # Perform health check
-            self._perform_health_check(verification_request)
-
-            # Perform capabilities check
-            self._verify_capabilities(verification_request)
-
-            # For now, skip security check (would be implemented as a separate task)
-            security_check = verification_request.checks.get(check_type='security')
-            security_check.status = 'passed'
-            security_check.message = "Basic security verification passed"
-            security_check.save()
-
-            # Check if all verifications passed
-            all_passed = all(
-                check.status == 'passed'
-                for check in verification_request.checks.all()
-            )
-
-            if all_passed:
-                verification_request.complete_verification(success=True)
-                result_serializer = VerificationResultSerializer(
-                    verification_request,
-                    context={'request': request}
-                )
-                return Response(result_serializer.data)
-            else:
-                failed_checks = verification_request.checks.filter(status='failed')
-                verification_request.status = 'failed'
-                verification_request.save()
-
-                return Response({
-                    "error": "Verification failed",
-                    "failed_checks": [
-                        {
-                            "type": check.check_type,
-                            "message": check.message or "Verification check failed"
-                        }
-                        for check in failed_checks
-                    ]
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            verification_request.status = 'failed'
-            verification_request.save()
-
-            return Response({
-                "error": "Ownership verification failed",
-                "message": ownership_check.message or "Could not verify server ownership"
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-    def _verify_dns(self, domain, token, check):
-        """Verify ownership using DNS TXT record."""
-        try:
-            # Try to get the TXT record
-            records = dns.resolver.resolve(f'_mcp-verification.{domain}', 'TXT')
-
-            for record in records:
-                # Convert record.to_text() which returns '"token"' to just 'token'
-                record_value = record.to_text().strip('"')
-                if record_value == token:
-                    check.details = {"domain": domain, "record_name": f"_mcp-verification.{domain}"}
-                    check.message = "DNS verification successful"
-                    check.save()
-                    return True
-
-            check.details = {"domain": domain, "error": "Token not found in DNS records"}
-            check.message = "Could not find matching TXT record"
-            check.save()
-            return False
-        except Exception as e:
-            logger.error(f"DNS verification error: {str(e)}", exc_info=True)
-            check.details = {"domain": domain, "error": str(e)}
-            check.message = f"DNS resolution error: {str(e)}"
-            check.save()
-            return False
-
-    def _verify_file(self, url, token, check):
-        """Verify ownership using file verification."""
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200 and token in response.text:
-                check.details = {"url": url}
-                check.message = "File verification successful"
-                check.save()
-                return True
-            else:
-                check.details = {
-                    "url": url,
-                    "status_code": response.status_code,
-                    "content": response.text[:100] + "..." if len(response.text) > 100 else response.text
-                }
-                check.message = f"File verification failed (status: {response.status_code})"
-                check.save()
-                return False
-        except Exception as e:
-            logger.error(f"File verification error: {str(e)}", exc_info=True)
-            check.details = {"url": url, "error": str(e)}
-            check.message = f"File request error: {str(e)}"
-            check.save()
-            return False
-
-    def _verify_meta_tag(self, url, token, check):
-        """Verify ownership using meta tag verification."""
-        try:
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                import re
-                # Look for meta tag in HTML
-                meta_pattern = re.compile(r'<meta\s+name=[\'"]mcp-verification[\'"]\s+content=[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
-                match = meta_pattern.search(response.text)
-
-                if match and match.group(1) == token:
-                    check.details = {"url": url}
-                    check.message = "Meta tag verification successful"
-                    check.save()
-                    return True
-                else:
-                    check.details = {"url": url, "error": "Meta tag not found or token doesn't match"}
-                    check.message = "Could not find matching meta tag"
-                    check.save()
-                    return False
-            else:
-                check.details = {"url": url, "status_code": response.status_code}
-                check.message = f"Meta tag verification failed (status: {response.status_code})"
-                check.save()
-                return False
-        except Exception as e:
-            logger.error(f"Meta tag verification error: {str(e)}", exc_info=True)
-            check.details = {"url": url, "error": str(e)}
-            check.message = f"Request error: {str(e)}"
-            check.save()
-            return False
-
-    def _perform_health_check(self, verification_request):
-        """Perform a health check on the server."""
-        server = verification_request.server
-        health_check = verification_request.checks.get(check_type='health')
-
-        is_healthy, response_time = check_server_health(server.url)
-
-        # Record health check
-        HealthCheck.objects.create(
-            server=server,
-            is_up=is_healthy,
-            response_time=response_time,
-            details={"check_type": "verification"}
-        )
+        verification_request.save(update_fields=['verification_method', 'verification_proof', 'status', 'updated_at'])
 
-        if is_healthy:
-            health_check.status = 'passed'
-            health_check.message = f"Server is healthy (response time: {response_time:.2f}s)"
-            health_check.details = {"response_time": response_time}
-        else:
-            health_check.status = 'failed'
-            health_check.message = "Server health check failed"
-            health_check.details = {"error": "Server is not responding"}
-
-        health_check.save()
-        return is_healthy
-
-    def _verify_capabilities(self, verification_request):
-        """Verify that the server provides the capabilities it claims to."""
-        return True  # Placeholder for capabilities verification logic
-        # server = verification_request.server
-        # capabilities_check = verification_request.checks.get(check_type='capabilities')
-
-        # try:
-        #     # Get server capabilities
-        #     response = requests.get(f"{server.url.rstrip('/')}/capabilities", timeout=10)
-
-        #     if response.status_code != 200:
-        #         capabilities_check.status = 'failed'
-        #         capabilities_check.message = f"Failed to retrieve capabilities (status: {response.status_code})"
-        #         capabilities_check.details = {"status_code": response.status_code}
-        #         capabilities_check.save()
-        #         return False
-
-        #     # Parse capabilities
-        #     try:
-        #         capabilities = response.json()
-
-        #         # Check if capabilities match what's registered
-        #         registered_capabilities = {c.name for c in server.capabilities.all()}
-        #         server_capabilities = set()
-
-        #         # Extract capability names from response (format may vary)
-        #         if isinstance(capabilities, list):
-        #             for cap in capabilities:
-        #                 if isinstance(cap, dict) and 'name' in cap:
-        #                     server_capabilities.add(cap['name'])
-        #         elif isinstance(capabilities, dict) and 'capabilities' in capabilities:
-        #             for cap in capabilities['capabilities']:
-        #                 if isinstance(cap, dict) and 'name' in cap:
-        #                     server_capabilities.add(cap['name'])
-
-        #         # Check for missing capabilities
-        #         missing_capabilities = registered_capabilities - server_capabilities
-
-        #         if missing_capabilities:
-        #             capabilities_check.status = 'failed'
-        #             capabilities_check.message = f"Missing capabilities: {', '.join(missing_capabilities)}"
-        #             capabilities_check.details = {
-        #                 "registered_capabilities": list(registered_capabilities),
-        #                 "server_capabilities": list(server_capabilities),
-        #                 "missing_capabilities": list(missing_capabilities)
-        #             }
-        #             capabilities_check.save()
-        #             return False
-        #         else:
-        #             capabilities_check.status = 'passed'
-        #             capabilities_check.message = "All registered capabilities are available"
-        #             capabilities_check.details = {
-        #                 "registered_capabilities": list(registered_capabilities),
-        #                 "server_capabilities": list(server_capabilities)
-        #             }
-        #             capabilities_check.save()
-        #             return True
-
-        #     except ValueError:
-        #         capabilities_check.status = 'failed'
-        #         capabilities_check.message = "Invalid capabilities format (not valid JSON)"
-        #         capabilities_check.details = {"response": response.text[:500]}
-        #         capabilities_check.save()
-        #         return False
-
-        # except Exception as e:
-        #     logger.error(f"Capabilities verification error: {str(e)}", exc_info=True)
-        #     capabilities_check.status = 'failed'
-        #     capabilities_check.message = f"Error checking capabilities: {str(e)}"
-        #     capabilities_check.details = {"error": str(e)}
-        #     capabilities_check.save()
-        #     return False
+        from verification.tasks import run_verification
 
+        # The probes talk to third-party hosts and can take tens of seconds,
+        # so they run on a worker; clients poll the status endpoint for the result
+        transaction.on_commit(lambda: run_verification.delay(str(verification_request.id)))
 
-class VerificationBadgeView(views.APIView):
-    """
-    API view for getting a verification badge.
-    """
-    permission_classes = [permissions.AllowAny]
-
-    def get(self, request, *args, **kwargs):
-        # Get the server
-        server_id = kwargs.get('server_id')
-        server = get_object_or_404(Server, id=server_id)
+        return Response(
+            VerificationStatusSerializer(verification_request).data,
+            status=status.HTTP_202_ACCEPTED
+        )
 
-        # Generate SVG badge
-        if server.verified:
-            badge_color = "#10b981"  # success green
-            badge_text = "Verified"
-        else:
-            badge_color = "#64748b"  # gray
-            badge_text = "Unverified"
 
-        svg = f"""
+def _render_badge(badge_color, badge_text):
+    """Render the SVG verification badge and a strong ETag for it."""
+    svg = f"""
         <svg xmlns="http://www.w3.org/2000/svg" width="110" height="20">
             <linearGradient id="b" x2="0" y2="100%">
                 <stop offset="0" stop-color="#bbb" stop-opacity=".1"/>
@@ -461,9 +233,47 @@ class VerificationBadgeView(views.APIView):
                 <text x="85" y="15" fill="#fff">{badge_text}</text>
             </g>
         </svg>
-        """
+    """
+    body = svg.encode()
+    return body, f'"{hashlib.md5(body).hexdigest()}"'
+
 
-        return HttpResponse(svg, content_type="image/svg+xml")
+# The only two badges there are, rendered once: (body, ETag) by verified flag
+_BADGES = {
+    True: _render_badge("#10b981", "Verified"),  # success green
+    False: _render_badge("#64748b", "Unverified"),  # gray
+}
+
+# Seconds clients and the server-side cache may keep a badge
+BADGE_MAX_AGE = 300
+
+
+class VerificationBadgeView(views.APIView):
+    """
+    API view for getting a verification badge.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        # Badges are embedded in READMEs and fetched on every page view, so
+        # remember each server's verified flag for as long as clients may
+        # cache the image
+        server_id = kwargs.get('server_id')
+        cache_key = f"verification:badge:{server_id}"
+        verified = cache.get(cache_key)
+        if verified is None:
+            verified = Server.objects.filter(id=server_id).values_list('verified', flat=True).first()
+            if verified is None:
+                raise Http404("Server not found")
+            cache.set(cache_key, verified, BADGE_MAX_AGE)
+
+        body, etag = _BADGES[verified]
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type="image/svg+xml")
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=BADGE_MAX_AGE)
+        return response
 
 
 class HealthCheckListView(generics.ListAPIView):
@@ -472,12 +282,18 @@ class HealthCheckListView(generics.ListAPIView):
     """
     serializer_class = HealthCheckSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    # Keyset pagination backed by the (server, -created_at, is_up) index
+    pagination_class = NewestFirstCursorPagination
 
     def get_queryset(self):
         server_id = self.kwargs.get('server_id')
-        server = get_object_or_404(Server, id=server_id)
+        server = get_object_or_404(Server.objects.only('id', 'owner_id'), id=server_id)
 
         # Check if the user is the server owner
         self.check_object_permissions(self.request, server)
 
-        return HealthCheck.objects.filter(server=server).order_by('-created_at')
\ No newline at end of file
+        # Of the server, the serializer only needs its name
+        return HealthCheck.objects.filter(server=server).select_related('server').only(
+            'id', 'server__name', 'is_up', 'response_time', 'status_code',
+            'error_message', 'details', 'created_at'
+        ).order_by('-created_at')
\ No newline at end of file
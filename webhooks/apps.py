@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class WebhooksConfig(AppConfig):
+    name = 'webhooks'
+
+    def ready(self):
+        from . import signals  # noqa: F401
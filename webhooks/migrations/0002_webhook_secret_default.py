@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:44
+
+import webhooks.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhooks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='webhook',
+            name='secret',
+            field=models.CharField(default=webhooks.models.generate_webhook_secret, editable=False, max_length=64),
+        ),
+    ]
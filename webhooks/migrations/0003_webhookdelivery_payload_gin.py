@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:44
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhooks', '0002_webhook_secret_default'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='webhookdelivery',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['payload'], name='webhooks_we_payload_cda948_gin'),
+        ),
+    ]
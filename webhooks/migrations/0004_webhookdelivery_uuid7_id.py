@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:44
+
+import common.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhooks', '0003_webhookdelivery_payload_gin'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='webhookdelivery',
+            name='id',
+            field=models.UUIDField(default=common.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
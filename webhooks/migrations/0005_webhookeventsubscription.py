@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-15 22:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhooks', '0004_webhookdelivery_uuid7_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEventSubscription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_name', models.CharField(choices=[('server.created', 'Server Created'), ('server.updated', 'Server Updated'), ('server.deleted', 'Server Deleted'), ('server.verified', 'Server Verified'), ('verification.requested', 'Verification Requested'), ('verification.completed', 'Verification Completed'), ('server.status_changed', 'Server Status Changed')], db_index=True, max_length=50)),
+                ('webhook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='event_subs', to='webhooks.webhook')),
+            ],
+            options={
+                'unique_together': {('webhook', 'event_name')},
+            },
+        ),
+        migrations.RunSQL(
+            sql=r"""
+                INSERT INTO webhooks_webhookeventsubscription (webhook_id, event_name)
+                SELECT DISTINCT id, unnest(events) FROM webhooks_webhook;
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
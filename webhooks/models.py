@@ -3,9 +3,23 @@ import secrets
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from common.utils import uuid7
 
 User = get_user_model()
 
+# Cache namespace for the active webhooks subscribed to each event
+WEBHOOK_SUBSCRIPTIONS_CACHE = 'webhooks:subscriptions'
+
+# Cache namespace whose version tells delivery workers their copies of
+# webhooks (URL, secret, active flag) are stale
+WEBHOOK_CONFIG_CACHE = 'webhooks:config'
+
+def generate_webhook_secret():
+    """Generate a new secret for signing webhook payloads."""
+    return secrets.token_hex(32)
+
+
 class Webhook(models.Model):
     """
     Model for webhook configurations.
@@ -33,7 +47,7 @@ class Webhook(models.Model):
     active = models.BooleanField(default=True)
 
     # Secret for signing webhook payloads
-    secret = models.CharField(max_length=64)
+    secret = models.CharField(max_length=64, default=generate_webhook_secret, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -41,12 +55,6 @@ class Webhook(models.Model):
     def __str__(self):
         return f"Webhook {self.id} for {self.owner.email}"
 
-    def save(self, *args, **kwargs):
-        """Generate a secret if one doesn't exist."""
-        if not self.secret:
-            self.secret = secrets.token_hex(32)
-        super().save(*args, **kwargs)
-
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -55,6 +63,21 @@ class Webhook(models.Model):
         ]
 
 
+class WebhookEventSubscription(models.Model):
+    """
+    One event a webhook subscribes to. Mirrors Webhook.events so an event's
+    subscribers are found by a btree lookup; kept in sync by webhooks.signals.
+    """
+    webhook = models.ForeignKey(Webhook, on_delete=models.CASCADE, related_name='event_subs')
+    event_name = models.CharField(max_length=50, choices=Webhook.EVENT_CHOICES, db_index=True)
+
+    def __str__(self):
+        return f"{self.webhook_id} -> {self.event_name}"
+
+    class Meta:
+        unique_together = ['webhook', 'event_name']
+
+
 class WebhookDelivery(models.Model):
     """
     Model for tracking webhook delivery attempts.
@@ -65,10 +88,12 @@ class WebhookDelivery(models.Model):
         ('pending', 'Pending'),
     ]
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Time-ordered, so new deliveries are appended to the primary key index
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     webhook = models.ForeignKey(Webhook, on_delete=models.CASCADE, related_name='deliveries')
 
     event = models.CharField(max_length=50)
+    # Large payloads are compressed by Postgres (lz4, see migration 0006)
     payload = models.JSONField()
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
 
@@ -88,5 +113,7 @@ class WebhookDelivery(models.Model):
             models.Index(fields=['webhook', '-created_at']),
             models.Index(fields=['status']),
             models.Index(fields=['event']),
+            # Containment lookups on the payload (payload__contains=...)
+            GinIndex(fields=['payload']),
         ]
         verbose_name_plural = "Webhook deliveries"
\ No newline at end of file
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from .models import Webhook, WebhookDelivery
 
+VALID_EVENTS = frozenset(choice[0] for choice in Webhook.EVENT_CHOICES)
+VALID_EVENTS_TEXT = ', '.join(choice[0] for choice in Webhook.EVENT_CHOICES)
+
 class WebhookSerializer(serializers.ModelSerializer):
     """Serializer for webhook configurations."""
     class Meta:
@@ -33,12 +36,13 @@ class WebhookUpdateSerializer(serializers.ModelSerializer):
 
     def validate_events(self, value):
         """Validate that events are from the allowed choices."""
-        valid_events = [choice[0] for choice in Webhook.EVENT_CHOICES]
-        for event in value:
-            if event not in valid_events:
-                raise serializers.ValidationError(
-                    f"Invalid event: {event}. Valid events are: {', '.join(valid_events)}"
-                )
+        invalid_events = set(value) - VALID_EVENTS
+        if invalid_events:
+            # Report the first bad event in the order it was given
+            event = next(event for event in value if event in invalid_events)
+            raise serializers.ValidationError(
+                f"Invalid event: {event}. Valid events are: {VALID_EVENTS_TEXT}"
+            )
         return value
 
 
@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.utils import bump_cache_version
+from .models import WEBHOOK_CONFIG_CACHE, WEBHOOK_SUBSCRIPTIONS_CACHE, Webhook, WebhookEventSubscription
+
+
+@receiver(post_save, sender=Webhook)
+def sync_webhook_event_subscriptions(sender, instance, update_fields=None, **kwargs):
+    """Mirror a saved webhook's events into its WebhookEventSubscription rows."""
+    if update_fields is not None and 'events' not in update_fields:
+        return
+
+    events = set(instance.events)
+    instance.event_subs.exclude(event_name__in=events).delete()
+    WebhookEventSubscription.objects.bulk_create(
+        [WebhookEventSubscription(webhook=instance, event_name=event) for event in events],
+        ignore_conflicts=True
+    )
+
+
+@receiver(post_save, sender=Webhook)
+@receiver(post_delete, sender=Webhook)
+def invalidate_webhook_subscriptions_cache(sender, **kwargs):
+    """Drop cached event subscriber lists whenever a webhook changes."""
+    bump_cache_version(WEBHOOK_SUBSCRIPTIONS_CACHE)
+
+
+@receiver(post_save, sender=Webhook)
+@receiver(post_delete, sender=Webhook)
+def invalidate_webhook_config_cache(sender, **kwargs):
+    """Make delivery workers reload their copies of webhooks."""
+    bump_cache_version(WEBHOOK_CONFIG_CACHE)
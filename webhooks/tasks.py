@@ -4,112 +4,356 @@ import hmac
 import hashlib
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from celery import shared_task
+from celery import group, shared_task
+from celery.utils.time import get_exponential_backoff_interval
 from django.utils import timezone
-from .models import Webhook, WebhookDelivery
+from django.core.cache import cache
+from django.db import connection
+from common.utils import build_http_session, get_cache_version
+from .models import WEBHOOK_CONFIG_CACHE, WEBHOOK_SUBSCRIPTIONS_CACHE, Webhook, WebhookDelivery, WebhookEventSubscription
+
+try:
+    import orjson
+except ImportError:  # optional; encode_payload falls back to the stdlib
+    orjson = None
 
 logger = logging.getLogger('mcp_nexus')
 
-def sign_payload(payload, secret):
+# Most bytes of a receiver's error response (or characters of a connection
+# error) kept on a delivery, so a misbehaving endpoint can't bloat the
+# deliveries table
+RESPONSE_BODY_LIMIT = 1000
+
+# Shared across deliveries in a worker process so repeat deliveries to a host
+# reuse its connection. Retrying is left to the task, which records each attempt.
+_SESSION = build_http_session(retries=0)
+
+# Webhooks change rarely, so each worker keeps the ones it delivered to
+# recently: webhook id -> (expiry, cache version, Webhook). Entries are
+# dropped as soon as a webhook change bumps WEBHOOK_CONFIG_CACHE's version,
+# and otherwise reloaded after WEBHOOK_CACHE_TTL seconds.
+_WEBHOOK_CACHE = {}
+WEBHOOK_CACHE_TTL = 60
+WEBHOOK_CACHE_SIZE = 2048
+
+# Keyed HMAC states by webhook secret, copied to sign each body. Keying on the
+# secret itself means a regenerated secret never picks up a stale state.
+_HMAC_CACHE = {}
+
+# Seconds an event's subscriber list is cached for
+WEBHOOK_SUBSCRIPTIONS_TTL = 30
+
+# An event's deliveries are queued in batches of this size, each batch sent
+# concurrently from WEBHOOK_DELIVERY_THREADS threads
+WEBHOOK_DELIVERY_BATCH_SIZE = 50
+WEBHOOK_DELIVERY_THREADS = 16
+
+# Fields written back after each delivery attempt
+DELIVERY_ATTEMPT_FIELDS = ['attempt_count', 'status', 'response_code', 'response_body', 'updated_at']
+
+# Fields a delivery attempt reads or writes; the webhook itself comes from
+# _get_webhook, so it isn't joined in
+DELIVERY_FIELDS = ['id', 'webhook_id', 'event', 'payload', 'attempt_count', 'status', 'response_code', 'response_body']
+
+# Old deliveries are deleted this many rows per statement, keeping each
+# transaction (and the WAL it writes) bounded
+CLEANUP_CHUNK_SIZE = 10000
+
+# Deliveries have no dependent rows or delete signals, so they're removed with
+# plain SQL rather than Delete's collect-then-delete passes
+CLEANUP_SQL = f"""
+DELETE FROM {WebhookDelivery._meta.db_table}
+WHERE id IN (
+    SELECT id FROM {WebhookDelivery._meta.db_table}
+    WHERE (status = 'success' AND created_at < %s)
+       OR (status = 'failed' AND created_at < %s)
+    LIMIT %s
+)
+RETURNING status
+"""
+
+def encode_payload(payload):
     """
-    Create a signature for a webhook payload.
+    Serialize a webhook payload to the bytes that are both signed and sent.
+
+    Keys are sorted so the same payload always encodes, and signs, the same.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+def sign_body(body, secret):
+    """
+    Create a signature for an encoded webhook body.
+
+    Keying an HMAC hashes the padded secret twice, so each secret is keyed
+    once per worker and copies of that state sign the bodies.
     """
-    key = secret.encode('utf-8')
-    message = json.dumps(payload, separators=(',', ':')).encode('utf-8')
-    signature = hmac.new(key, message, hashlib.sha256).hexdigest()
-    return signature
+    keyed = _HMAC_CACHE.get(secret)
+    if keyed is None:
+        if len(_HMAC_CACHE) >= WEBHOOK_CACHE_SIZE:
+            _HMAC_CACHE.clear()
+        keyed = _HMAC_CACHE[secret] = hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+    signer = keyed.copy()
+    signer.update(body)
+    return signer.hexdigest()
+
+def _get_webhook(webhook_id, version=None):
+    """
+    Load the webhook fields a delivery needs, reusing a copy loaded by this
+    worker within the last WEBHOOK_CACHE_TTL seconds unless a webhook has
+    changed since. Callers loading several webhooks can pass the
+    WEBHOOK_CONFIG_CACHE version they already fetched.
+    """
+    if version is None:
+        version = get_cache_version(WEBHOOK_CONFIG_CACHE)
+    now = time.monotonic()
+    cached = _WEBHOOK_CACHE.get(webhook_id)
+    if cached is not None and cached[0] > now and cached[1] == version:
+        return cached[2]
+
+    webhook = Webhook.objects.only('id', 'url', 'secret', 'active').get(id=webhook_id)
+    if len(_WEBHOOK_CACHE) >= WEBHOOK_CACHE_SIZE:
+        _WEBHOOK_CACHE.clear()
+    _WEBHOOK_CACHE[webhook_id] = (now + WEBHOOK_CACHE_TTL, version, webhook)
+    return webhook
+
+
+def _get_subscribed_events(version):
+    """
+    The set of events with at least one active subscriber, so events nobody
+    listens to are dropped without looking up their subscribers.
+    """
+    return cache.get_or_set(
+        f"{WEBHOOK_SUBSCRIPTIONS_CACHE}:{version}:events",
+        lambda: frozenset(
+            WebhookEventSubscription.objects.filter(webhook__active=True)
+            .values_list('event_name', flat=True)
+            .distinct()
+        ),
+        WEBHOOK_SUBSCRIPTIONS_TTL
+    )
+
+
+def _get_subscribed_webhook_ids(event):
+    """
+    List the active webhooks subscribed to an event, cached briefly and
+    invalidated by webhooks.signals whenever a webhook changes.
+    """
+    version = get_cache_version(WEBHOOK_SUBSCRIPTIONS_CACHE)
+    if event not in _get_subscribed_events(version):
+        return []
+
+    cache_key = f"{WEBHOOK_SUBSCRIPTIONS_CACHE}:{version}:{event}"
+    return cache.get_or_set(
+        cache_key,
+        lambda: list(
+            Webhook.objects.filter(active=True, event_subs__event_name=event).values_list('id', flat=True)
+        ),
+        WEBHOOK_SUBSCRIPTIONS_TTL
+    )
+
+
+class RetryableHTTPStatus(Exception):
+    """A webhook receiver answered with a 5xx status, so the delivery is retried."""
+
+
+def _send_delivery(delivery, webhook):
+    """
+    POST a delivery to its webhook and record the outcome on the (unsaved)
+    delivery. Raises RequestException or RetryableHTTPStatus when the attempt
+    should be retried.
+    """
+    # Encode the payload once; the signature covers exactly the bytes sent
+    body = encode_payload(delivery.payload)
+
+    # Prepare headers, signed unless the webhook has no secret
+    headers = {
+        'Content-Type': 'application/json',
+        'User-Agent': 'MCP-Nexus-Webhook/1.0',
+        'X-MCP-Nexus-Event': delivery.event,
+        'X-MCP-Nexus-Delivery': str(delivery.id),
+        'X-MCP-Nexus-Timestamp': str(int(time.time()))
+    }
+    if webhook.secret:
+        headers['X-MCP-Nexus-Signature'] = f'sha256={sign_body(body, webhook.secret)}'
+
+    # Send the webhook, streaming the response so its body is only read
+    # as far as it's needed
+    try:
+        with _SESSION.post(
+            webhook.url,
+            headers=headers,
+            data=body,
+            timeout=10,
+            stream=True
+        ) as response:
+            delivery.response_code = response.status_code
+            if 200 <= response.status_code < 300:
+                # Nobody reads a successful receiver's reply; discard it
+                # undecoded so the connection goes back to the pool
+                delivery.response_body = ''
+                response.raw.drain_conn()
+            else:
+                delivery.response_body = response.raw.read(
+                    RESPONSE_BODY_LIMIT, decode_content=True
+                ).decode('utf-8', 'replace')
 
-@shared_task(bind=True, max_retries=3)
+        # Check if successful (2xx status)
+        if 200 <= response.status_code < 300:
+            delivery.status = 'success'
+            logger.info(f"Webhook delivery {delivery.id} succeeded with status {response.status_code}")
+        else:
+            delivery.status = 'failed'
+            logger.warning(f"Webhook delivery {delivery.id} failed with status {response.status_code}")
+
+            # Retry for 5xx errors
+            if response.status_code >= 500:
+                raise RetryableHTTPStatus(response.status_code)
+
+    except requests.RequestException as e:
+        delivery.status = 'failed'
+        delivery.response_body = str(e)[:RESPONSE_BODY_LIMIT]
+        logger.error(f"Webhook delivery {delivery.id} failed: {str(e)}")
+
+        # Retry on connection errors
+        raise
+
+
+def _attempt_delivery(delivery, webhook):
+    """Send one delivery from a batch; returns True if it should be retried."""
+    try:
+        _send_delivery(delivery, webhook)
+    except (requests.RequestException, RetryableHTTPStatus):
+        return True
+    except Exception as e:
+        delivery.status = 'failed'
+        logger.error(f"Error processing webhook delivery {delivery.id}: {str(e)}", exc_info=True)
+    return False
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(requests.RequestException, RetryableHTTPStatus),
+    retry_backoff=60,
+    retry_backoff_max=30 * 60,
+    retry_jitter=True,
+    max_retries=2
+)
 def process_webhook_delivery(self, delivery_id):
     """
     Process a webhook delivery.
+
+    Connection errors and 5xx responses are retried by Celery with jittered
+    exponential backoff, for up to three attempts in all.
     """
     try:
-        delivery = WebhookDelivery.objects.get(id=delivery_id)
-        webhook = delivery.webhook
+        delivery = WebhookDelivery.objects.only(*DELIVERY_FIELDS).get(id=delivery_id)
+        webhook = _get_webhook(delivery.webhook_id)
 
         # Check if webhook is still active
         if not webhook.active:
-            delivery.status = 'failed'
-            delivery.response_body = 'Webhook is inactive'
-            delivery.save()
+            WebhookDelivery.objects.filter(id=delivery_id).update(
+                status='failed',
+                response_body='Webhook is inactive',
+                updated_at=timezone.now()
+            )
             logger.info(f"Skipped delivery {delivery_id} to inactive webhook {webhook.id}")
             return
 
-        # Increment attempt count
+        # Increment attempt count; saved with the outcome below
         delivery.attempt_count += 1
-        delivery.save()
-
-        # Prepare headers with signature
-        signature = sign_payload(delivery.payload, webhook.secret)
-        headers = {
-            'Content-Type': 'application/json',
-            'User-Agent': 'MCP-Nexus-Webhook/1.0',
-            'X-MCP-Nexus-Event': delivery.event,
-            'X-MCP-Nexus-Delivery': str(delivery.id),
-            'X-MCP-Nexus-Signature': f'sha256={signature}',
-            'X-MCP-Nexus-Timestamp': str(int(time.time()))
-        }
 
-        # Send the webhook
-        start_time = time.time()
         try:
-            response = requests.post(
-                webhook.url,
-                headers=headers,
-                json=delivery.payload,
-                timeout=10
-            )
-
-            # Record response
-            delivery.response_code = response.status_code
-            delivery.response_body = response.text[:1000]  # Limit response size
-
-            # Check if successful (2xx status)
-            if 200 <= response.status_code < 300:
-                delivery.status = 'success'
-                logger.info(f"Webhook delivery {delivery_id} succeeded with status {response.status_code}")
-            else:
-                delivery.status = 'failed'
-                logger.warning(f"Webhook delivery {delivery_id} failed with status {response.status_code}")
-
-                # Retry for 5xx errors
-                if response.status_code >= 500 and delivery.attempt_count < 3:
-                    raise self.retry(countdown=60 * (2 ** (delivery.attempt_count - 1)))
-
-        except requests.RequestException as e:
-            delivery.status = 'failed'
-            delivery.response_body = str(e)
-            logger.error(f"Webhook delivery {delivery_id} failed: {str(e)}")
-
-            # Retry on connection errors
-            if delivery.attempt_count < 3:
-                raise self.retry(countdown=60 * (2 ** (delivery.attempt_count - 1)))
-
+            _send_delivery(delivery, webhook)
         finally:
-            # Save delivery record
-            delivery.save()
+            # Save the attempt and its outcome in one write
+            delivery.save(update_fields=DELIVERY_ATTEMPT_FIELDS)
 
     except WebhookDelivery.DoesNotExist:
         logger.error(f"Webhook delivery {delivery_id} not found")
+    except (requests.RequestException, RetryableHTTPStatus):
+        # Leave these to autoretry_for
+        raise
     except Exception as e:
         logger.error(f"Error processing webhook delivery {delivery_id}: {str(e)}", exc_info=True)
 
 
 @shared_task
-def retry_webhook_delivery(delivery_id):
+def process_webhook_delivery_batch(delivery_ids):
     """
-    Retry a failed webhook delivery.
+    Make the first attempt at a batch of deliveries concurrently.
+
+    Only the HTTP requests run on the thread pool; the deliveries are loaded
+    and saved here. Deliveries that should be retried are handed to
+    process_webhook_delivery as its first retry, keeping the same backoff and
+    overall attempt limit.
     """
     try:
-        delivery = WebhookDelivery.objects.get(id=delivery_id, status='failed')
-        process_webhook_delivery.delay(str(delivery.id))
-        logger.info(f"Queued webhook delivery {delivery_id} for retry")
-    except WebhookDelivery.DoesNotExist:
-        logger.error(f"Failed webhook delivery {delivery_id} not found")
+        deliveries = list(WebhookDelivery.objects.only(*DELIVERY_FIELDS).filter(id__in=delivery_ids))
+        version = get_cache_version(WEBHOOK_CONFIG_CACHE)
+        webhooks = {
+            webhook_id: _get_webhook(webhook_id, version)
+            for webhook_id in {delivery.webhook_id for delivery in deliveries}
+        }
+
+        now = timezone.now()
+        inactive = [d.id for d in deliveries if not webhooks[d.webhook_id].active]
+        if inactive:
+            WebhookDelivery.objects.filter(id__in=inactive).update(
+                status='failed',
+                response_body='Webhook is inactive',
+                updated_at=now
+            )
+            logger.info(f"Skipped {len(inactive)} deliveries to inactive webhooks")
+
+        active = [d for d in deliveries if webhooks[d.webhook_id].active]
+        if not active:
+            return
+        for delivery in active:
+            delivery.attempt_count += 1
+            delivery.updated_at = now
+
+        with ThreadPoolExecutor(max_workers=min(WEBHOOK_DELIVERY_THREADS, len(active))) as executor:
+            retry = list(executor.map(
+                lambda delivery: _attempt_delivery(delivery, webhooks[delivery.webhook_id]),
+                active
+            ))
+
+        WebhookDelivery.objects.bulk_update(active, DELIVERY_ATTEMPT_FIELDS)
+
+        for delivery, should_retry in zip(active, retry):
+            if should_retry:
+                process_webhook_delivery.apply_async(
+                    (str(delivery.id),),
+                    retries=1,
+                    # Jittered like the task's own retries, so an outage's
+                    # retries don't all land at once
+                    countdown=get_exponential_backoff_interval(
+                        factor=process_webhook_delivery.retry_backoff,
+                        retries=0,
+                        maximum=process_webhook_delivery.retry_backoff_max,
+                        full_jitter=True
+                    )
+                )
+
     except Exception as e:
-        logger.error(f"Error retrying webhook delivery {delivery_id}: {str(e)}", exc_info=True)
+        logger.error(f"Error processing webhook delivery batch: {str(e)}", exc_info=True)
+
+
+def _queue_deliveries(deliveries):
+    """Save new deliveries in bulk and queue them in batches, all at once."""
+    # Their ids are generated in Python, so they're known without reading
+    # the rows back
+    deliveries = WebhookDelivery.objects.bulk_create(deliveries, batch_size=500)
+
+    delivery_ids = [str(delivery.id) for delivery in deliveries]
+    group(
+        process_webhook_delivery_batch.s(delivery_ids[i:i + WEBHOOK_DELIVERY_BATCH_SIZE])
+        for i in range(0, len(delivery_ids), WEBHOOK_DELIVERY_BATCH_SIZE)
+    ).apply_async()
 
 
 @shared_task
@@ -119,20 +363,15 @@ def trigger_webhooks_for_event(event, payload):
     """
     try:
         # Find all active webhooks subscribed to this event
-        webhooks = Webhook.objects.filter(active=True, events__contains=[event])
-        logger.info(f"Triggering {webhooks.count()} webhooks for event {event}")
-
-        for webhook in webhooks:
-            # Create delivery record
-            delivery = WebhookDelivery.objects.create(
-                webhook=webhook,
-                event=event,
-                payload=payload,
-                status='pending'
-            )
+        webhook_ids = _get_subscribed_webhook_ids(event)
+        logger.info(f"Triggering {len(webhook_ids)} webhooks for event {event}")
+        if not webhook_ids:
+            return
 
-            # Queue delivery task
-            process_webhook_delivery.delay(str(delivery.id))
+        _queue_deliveries([
+            WebhookDelivery(webhook_id=webhook_id, event=event, payload=payload, status='pending')
+            for webhook_id in webhook_ids
+        ])
 
     except Exception as e:
         logger.error(f"Error triggering webhooks for event {event}: {str(e)}", exc_info=True)
@@ -148,20 +387,17 @@ def clean_old_webhook_deliveries():
         success_threshold = timezone.now() - timedelta(days=30)
         failure_threshold = timezone.now() - timedelta(days=90)
 
-        # Delete old records
-        old_success = WebhookDelivery.objects.filter(
-            status='success',
-            created_at__lt=success_threshold
-        )
-        success_count = old_success.count()
-        old_success.delete()
-
-        old_failure = WebhookDelivery.objects.filter(
-            status='failed',
-            created_at__lt=failure_threshold
-        )
-        failure_count = old_failure.count()
-        old_failure.delete()
+        # Delete old records in chunks, counting them by status as they go
+        success_count = failure_count = 0
+        with connection.cursor() as cursor:
+            while True:
+                cursor.execute(CLEANUP_SQL, [success_threshold, failure_threshold, CLEANUP_CHUNK_SIZE])
+                statuses = [status for (status,) in cursor.fetchall()]
+                success = statuses.count('success')
+                success_count += success
+                failure_count += len(statuses) - success
+                if len(statuses) < CLEANUP_CHUNK_SIZE:
+                    break
 
         logger.info(f"Cleaned {success_count} successful and {failure_count} failed webhook deliveries")
 
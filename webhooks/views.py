@@ -1,11 +1,13 @@
 import logging
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status, permissions, viewsets, generics, views
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.utils import extend_schema
 
-from .models import Webhook, WebhookDelivery
+from common.utils import bump_cache_version
+from .models import WEBHOOK_CONFIG_CACHE, Webhook, WebhookDelivery, generate_webhook_secret
 from .serializers import (
     WebhookSerializer,
     WebhookCreateSerializer,
@@ -28,40 +30,6 @@ class IsOwnerOrAdmin(permissions.BasePermission):
         # Allow webhook owner
         return obj.owner == request.user
 
-@extend_schema_view(
-    list=extend_schema(
-        summary="List webhooks",
-        description="Get a list of all webhooks configured by the current user."
-    ),
-    retrieve=extend_schema(
-        summary="Get webhook details",
-        description="Get detailed information about a specific webhook."
-    ),
-    create=extend_schema(
-        summary="Create webhook",
-        description="Create a new webhook for event notifications."
-    ),
-    update=extend_schema(
-        summary="Update webhook",
-        description="Update an existing webhook configuration."
-    ),
-    partial_update=extend_schema(
-        summary="Partially update webhook",
-        description="Partially update an existing webhook configuration."
-    ),
-    destroy=extend_schema(
-        summary="Delete webhook",
-        description="Delete a webhook configuration."
-    ),
-    regenerate_secret=extend_schema(
-        summary="Regenerate webhook secret",
-        description="Generate a new secret for signing webhook payloads."
-    ),
-    deliveries=extend_schema(
-        summary="List webhook deliveries",
-        description="Get a list of delivery attempts for a specific webhook."
-    )
-)
 class WebhookViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing webhook configurations.
@@ -81,6 +49,10 @@ class WebhookViewSet(viewsets.ModelViewSet):
             return WebhookUpdateSerializer
         return WebhookSerializer
 
+    @extend_schema(
+        summary="Regenerate webhook secret",
+        description="Generate a new secret for signing webhook payloads."
+    )
     @action(detail=True, methods=['post'])
     def regenerate_secret(self, request, pk=None):
         """
@@ -88,15 +60,21 @@ class WebhookViewSet(viewsets.ModelViewSet):
         """
         webhook = self.get_object()
 
-        # Clear secret to trigger automatic regeneration
-        webhook.secret = ''
-        webhook.save()
+        # A single UPDATE, which sends no signals, so tell delivery workers
+        # to drop their copies signed with the old secret here
+        webhook.secret = generate_webhook_secret()
+        Webhook.objects.filter(pk=webhook.pk).update(secret=webhook.secret, updated_at=timezone.now())
+        bump_cache_version(WEBHOOK_CONFIG_CACHE)
 
         return Response({
             'id': webhook.id,
             'secret': webhook.secret
         })
 
+    @extend_schema(
+        summary="List webhook deliveries",
+        description="Get a list of delivery attempts for a specific webhook."
+    )
     @action(detail=True, methods=['get'])
     def deliveries(self, request, pk=None):
         """
@@ -123,7 +101,7 @@ class WebhookDeliveryDetailView(generics.RetrieveAPIView):
 
     def get_queryset(self):
         """Return deliveries for webhooks owned by the current user."""
-        return WebhookDelivery.objects.filter(webhook__owner=self.request.user)
+        return WebhookDelivery.objects.select_related('webhook').filter(webhook__owner=self.request.user)
 
 
 class WebhookDeliveryRetryView(views.APIView):
@@ -145,7 +123,7 @@ class WebhookDeliveryRetryView(views.APIView):
         # Get the delivery
         delivery_id = kwargs.get('delivery_id')
         delivery = get_object_or_404(
-            WebhookDelivery,
+            WebhookDelivery.objects.select_related('webhook'),
             id=delivery_id,
             webhook__owner=request.user
         )
@@ -165,8 +143,9 @@ class WebhookDeliveryRetryView(views.APIView):
             )
 
         # Queue delivery for retry
-        from .tasks import retry_webhook_delivery
-        retry_webhook_delivery.delay(str(delivery.id))
+        from .tasks import process_webhook_delivery
+        process_webhook_delivery.delay(str(delivery.id))
+        logger.info(f"Queued webhook delivery {delivery.id} for retry")
 
         return Response(
             {"message": "Webhook delivery queued for retry"},